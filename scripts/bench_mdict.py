@@ -0,0 +1,695 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the vendored mdict lookup engine
+
+Each benchmark builds a synthetic dictionary in a temporary directory (see
+tests/fixtures/mdict_writer.py), so no real dictionary is required.
+
+Usage:
+    python scripts/bench_mdict.py [benchmark] [--entries N] [--words N]
+
+    benchmark: lookup, batch, binary, bloom, bulk, crypto, fallback, keys, lemma, links,
+               lzo, partial, pragmas, schema, sparse, suggest, verify, volumes
+    Default: lookup
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+sys.path.insert(0, str(ROOT / "src" / "mdxscraper" / "mdict" / "vendor"))
+
+from fixtures.mdict_writer import sample_entries, write_mdd, write_mdx  # noqa: E402
+
+from mdxscraper.core.dictionary import Dictionary  # noqa: E402
+
+
+def make_dictionary(workdir: Path, entries: int) -> Path:
+    """Write a synthetic .mdx with ``entries`` headwords and build its index"""
+    mdx_file = write_mdx(workdir / "bench.mdx", sample_entries(entries), records_per_block=64)
+    Dictionary(mdx_file).close()
+    return mdx_file
+
+
+def pick_words(entries: int, count: int, miss_ratio: float = 0.1) -> list[str]:
+    """Random sample of headwords, ``miss_ratio`` of them absent from the dictionary"""
+    rng = random.Random(42)
+    words = [f"word{rng.randrange(entries):06d}" for _ in range(count)]
+    for i in range(int(count * miss_ratio)):
+        words[i] = f"missing-{i}"
+    rng.shuffle(words)
+    return words
+
+
+def report(label: str, seconds: float, count: int) -> None:
+    print(f"  {label:<28} {seconds * 1e6 / count:10.2f} µs/word   ({seconds:.3f}s total)")
+
+
+def bench_lookup(args: argparse.Namespace) -> None:
+    """Per-word latency of Dictionary.lookup_html: per-query connections vs pooled"""
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = make_dictionary(Path(tmp), args.entries)
+        words = pick_words(args.entries, args.words)
+        print(f"lookup: {args.entries} entries, {len(words)} words (10% misses)")
+
+        with Dictionary(mdx_file) as dictionary:
+            builder = dictionary.impl
+
+            # Baseline: the previous behaviour, one sqlite3.connect() per query
+            pooled = builder._connection
+            builder._connection = lambda db: sqlite3.connect(db)
+            start = time.perf_counter()
+            for word in words:
+                dictionary.lookup_html(word)
+            report("connect per query (before)", time.perf_counter() - start, len(words))
+
+            builder._connection = pooled
+            start = time.perf_counter()
+            for word in words:
+                dictionary.lookup_html(word)
+            report("pooled connection (after)", time.perf_counter() - start, len(words))
+
+
+def bench_batch(args: argparse.Namespace) -> None:
+    """Dictionary.lookup_html per word vs one Dictionary.lookup_html_many call"""
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = make_dictionary(Path(tmp), args.entries)
+        words = sorted(pick_words(args.entries, args.words))
+        print(f"batch: {args.entries} entries, {len(words)} sorted words (10% misses)")
+
+        with Dictionary(mdx_file, block_cache_size=0) as dictionary:
+            start = time.perf_counter()
+            for word in words:
+                dictionary.lookup_html(word)
+            report("lookup_html per word", time.perf_counter() - start, len(words))
+
+            start = time.perf_counter()
+            dictionary.lookup_html_many(words)
+            report("lookup_html_many", time.perf_counter() - start, len(words))
+
+
+def bench_fallback(args: argparse.Namespace) -> None:
+    """Cost of a word that misses the exact match: lower()/replace() scans vs normalized keys"""
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = make_dictionary(Path(tmp), args.entries)
+        rng = random.Random(7)
+        words = [f"Word-{rng.randrange(args.entries):06d}" for _ in range(args.words // 10)]
+        print(f"fallback: {args.entries} entries, {len(words)} words needing the fallback chain")
+
+        with Dictionary(mdx_file) as dictionary:
+            builder = dictionary.impl
+            conn = builder._connection(builder._mdx_db)
+
+            # Baseline: the previous chain, exact then two full-table scans
+            start = time.perf_counter()
+            for word in words:
+                conn.execute("SELECT * FROM KEYS WHERE key_text = ?", (word,)).fetchall()
+                conn.execute(
+                    "SELECT * FROM KEYS WHERE lower(key_text) = lower(?)", (word,)
+                ).fetchall()
+                conn.execute(
+                    "SELECT * FROM KEYS WHERE lower(replace(key_text, '-', '')) = lower(?)",
+                    (word.replace("-", ""),),
+                ).fetchall()
+            report("scan chain (before)", time.perf_counter() - start, len(words))
+
+            start = time.perf_counter()
+            for word in words:
+                builder.lookup_normalized_indexes(builder._mdx_db, word)
+            report("normalized keys (after)", time.perf_counter() - start, len(words))
+
+
+def bench_links(args: argparse.Namespace) -> None:
+    """Redirect entries: following @@@LINK hops per lookup vs chains resolved when indexing"""
+    import mdict_query
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # every headword gets an alias redirecting to it, and every alias a second one
+        entries = sample_entries(args.entries)
+        entries += [(f"alias{key}", f"@@@LINK={key}") for key, _ in sample_entries(args.entries)]
+        entries += [(f"alt{key}", f"@@@LINK=alias{key}") for key, _ in entries[: args.entries]]
+        mdx_file = write_mdx(Path(tmp) / "bench.mdx", sorted(entries), records_per_block=64)
+        rng = random.Random(7)
+        words = [f"alt{rng.choice(entries)[0]}" for _ in range(args.words)]
+        words = [word for word in words if not word.startswith(("altalias", "altalt"))]
+        print(f"links: {len(entries)} entries, {len(words)} words two hops from their entry")
+
+        write_links = mdict_query._write_links
+        for label, resolve in (("build without LINKS", False), ("build with LINKS", True)):
+            mdict_query._write_links = write_links if resolve else lambda conn, mdx_file: None
+            start = time.perf_counter()
+            mdict_query.IndexBuilder(str(mdx_file), force_rebuild=True).close()
+            print(f"  {label:<28} {time.perf_counter() - start:10.3f} s")
+        mdict_query._write_links = write_links
+
+        with mdict_query.IndexBuilder(str(mdx_file)) as builder:
+            start = time.perf_counter()
+            for word in words:
+                definition = builder.mdx_lookup_normalized(word, resolve_links=False)[0]
+                while definition.startswith("@@@LINK="):
+                    linked_word = definition[len("@@@LINK=") :].strip()
+                    definition = builder.mdx_lookup_normalized(linked_word, resolve_links=False)[0]
+            report("hop per lookup (before)", time.perf_counter() - start, len(words))
+
+            start = time.perf_counter()
+            for word in words:
+                builder.mdx_lookup_normalized(word)
+            report("LINKS join (after)", time.perf_counter() - start, len(words))
+
+            start = time.perf_counter()
+            for word in words:
+                builder.mdx_lookup_normalized(word[len("alt") :])
+            report("direct hit, for reference", time.perf_counter() - start, len(words))
+
+
+def bench_lemma(args: argparse.Namespace) -> None:
+    """Lemma fallback: a lookup per candidate until one hits vs all candidates in one probe"""
+    from mdxscraper.core.lemmatizer import lemma_candidates
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = make_dictionary(Path(tmp), args.entries)
+        rng = random.Random(7)
+        suffixes = ("s", "es", "ing", "ed", "er", "ly")
+        words = [word + rng.choice(suffixes) for word in pick_words(args.entries, args.words)]
+        print(f"lemma: {args.entries} entries, {len(words)} inflected words (10% no lemma)")
+        with Dictionary(mdx_file) as dictionary:
+            start = time.perf_counter()
+            for word in words:
+                for candidate in lemma_candidates(word):
+                    if dictionary.lookup_html(candidate):
+                        break
+            report("lookup per candidate (before)", time.perf_counter() - start, len(words))
+
+            start = time.perf_counter()
+            dictionary.lookup_lemma_many(words)
+            report("one probe (after)", time.perf_counter() - start, len(words))
+
+
+def build_flat_index(mdx_file: Path, db: Path) -> None:
+    """The pre-2.0 layout: one MDX_INDEX row per key repeating its block's values"""
+    from mdict_keys import NORMALIZED_KEYS, normalized_forms
+    from readmdict import MDX
+
+    index = MDX(str(mdx_file)).get_index(check_block=False)
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE MDX_INDEX (key_text text not null, file_path text, file_pos integer,"
+        " compressed_size integer, decompressed_size integer, record_block_type integer,"
+        " record_start integer, record_end integer, offset integer,"
+        " key_lower text, key_strip text, key_fold text)"
+    )
+    fields = ("file_pos", "compressed_size", "decompressed_size", "record_block_type")
+    conn.executemany(
+        "INSERT INTO MDX_INDEX VALUES (?,?,?,?,?,?,?,?,?,?,?,?)",
+        [
+            (item["key_text"], None)
+            + tuple(item[f] for f in fields)
+            + (item["record_start"], item["record_end"], item["offset"])
+            + normalized_forms(item["key_text"])
+            for item in index["index_dict_list"]
+        ],
+    )
+    conn.execute("CREATE INDEX key_index ON MDX_INDEX (key_text)")
+    for column, _ in NORMALIZED_KEYS:
+        conn.execute(f"CREATE INDEX {column}_index ON MDX_INDEX ({column})")
+    conn.commit()
+    conn.close()
+
+
+def bench_partial(args: argparse.Namespace) -> None:
+    """Cold lookups in large record blocks: whole-block zlib vs partial decompression"""
+    from mdict_query import IndexBuilder
+
+    per_block = 2048
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = write_mdx(
+            Path(tmp) / "bench.mdx", sample_entries(args.entries), records_per_block=per_block
+        )
+        rng = random.Random(42)
+        # every word in a different block from the previous one, so each lookup is cold
+        blocks = max(1, args.entries // per_block)
+        anywhere = [rng.randrange(args.entries) for _ in range(args.words)]
+        near_start = [
+            min(args.entries - 1, (i % blocks) * per_block + rng.randrange(per_block // 10))
+            for i in range(args.words)
+        ]
+        print(f"partial: {args.entries} entries in {blocks} blocks of {per_block} records")
+        for label, ids in (
+            ("anywhere in the block", anywhere),
+            ("first 10% of a block", near_start),
+        ):
+            words = [f"word{i:06d}" for i in ids]
+            print(f"  {label}:")
+            for name, partial in (("whole block (before)", False), ("partial (after)", True)):
+                with IndexBuilder(
+                    str(mdx_file), block_cache_size=0, partial_decompress=partial
+                ) as builder:
+                    start = time.perf_counter()
+                    for word in words:
+                        builder.mdx_lookup(word)
+                    report(name, time.perf_counter() - start, len(words))
+
+
+def bench_schema(args: argparse.Namespace) -> None:
+    """Index build time and .mdx.db size: flat MDX_INDEX rows vs BLOCKS + KEYS tables"""
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = write_mdx(
+            Path(tmp) / "bench.mdx", sample_entries(args.entries), records_per_block=64
+        )
+        print(f"schema: {args.entries} entries, 64 records per block")
+
+        flat_db = Path(tmp) / "flat.db"
+        start = time.perf_counter()
+        build_flat_index(mdx_file, flat_db)
+        flat_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Dictionary(mdx_file).close()
+        split_seconds = time.perf_counter() - start
+        split_db = mdx_file.with_suffix(".mdx.db")
+
+        for label, seconds, db in (
+            ("flat MDX_INDEX (before)", flat_seconds, flat_db),
+            ("BLOCKS + KEYS (after)", split_seconds, split_db),
+        ):
+            size = db.stat().st_size / 2**20
+            print(f"  {label:<28} build {seconds:7.2f}s   {size:8.1f} MiB")
+
+
+def bench_sparse(args: argparse.Namespace) -> None:
+    """Time to first result and per-word latency: SQLite index vs index-free sparse lookups"""
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = write_mdx(Path(tmp) / "bench.mdx", sample_entries(args.entries))
+        words = pick_words(args.entries, args.words)
+        print(f"sparse: {args.entries} entries, {len(words)} words (10% misses)")
+        for name, backend in (("SQLite index (before)", "sqlite"), ("sparse (after)", "sparse")):
+            start = time.perf_counter()
+            with Dictionary(mdx_file, backend=backend) as dictionary:
+                dictionary.lookup_html(words[0])
+                first = time.perf_counter() - start
+                print(f"  {name:<28} first result after {first * 1e3:9.1f} ms")
+                start = time.perf_counter()
+                for word in words:
+                    dictionary.lookup_html(word)
+                report(name, time.perf_counter() - start, len(words))
+
+
+def bench_binary(args: argparse.Namespace) -> None:
+    """Exact and normalized lookups: SQL queries vs the memory-mapped binary index"""
+    from mdict_query import IndexBuilder
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = write_mdx(Path(tmp) / "bench.mdx", sample_entries(args.entries))
+        words = pick_words(args.entries, args.words)
+        print(f"binary: {args.entries} entries, {len(words)} words (10% misses)")
+        # both indexes are built up front: this times opening them, not building
+        IndexBuilder(str(mdx_file), backend="binary").close()
+        for name, backend in (("SQLite (before)", "sqlite"), ("binary index (after)", "binary")):
+            start = time.perf_counter()
+            builder = IndexBuilder(str(mdx_file), backend=backend)
+            print(f"  {name:<28} open {(time.perf_counter() - start) * 1e3:9.1f} ms")
+            with builder:
+                for label, lookup in (
+                    ("exact", builder.lookup_indexes),
+                    ("normalized", builder.lookup_normalized_indexes),
+                ):
+                    start = time.perf_counter()
+                    for word in words:
+                        lookup(builder._mdx_db, word)
+                    report(f"{name}, {label}", time.perf_counter() - start, len(words))
+
+
+def bench_pragmas(args: argparse.Namespace) -> None:
+    """Index build time and lookup latency: SQLite default settings vs the "fast" profiles"""
+    from mdict_query import IndexBuilder
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = write_mdx(
+            Path(tmp) / "bench.mdx", sample_entries(args.entries), records_per_block=64
+        )
+        words = pick_words(args.entries, args.words)
+        print(f"pragmas: {args.entries} entries, {len(words)} words (10% misses)")
+        for name, profile in (("default (before)", "default"), ("fast (after)", "fast")):
+            start = time.perf_counter()
+            builder = IndexBuilder(
+                str(mdx_file), force_rebuild=True, build_profile=profile, read_profile=profile
+            )
+            print(f"  {name:<28} build {time.perf_counter() - start:7.2f}s")
+            with builder:
+                for label, lookup in (
+                    ("exact", builder.lookup_indexes),
+                    ("normalized", builder.lookup_normalized_indexes),
+                ):
+                    start = time.perf_counter()
+                    for word in words:
+                        lookup(builder._mdx_db, word)
+                    report(f"{name}, {label}", time.perf_counter() - start, len(words))
+                start = time.perf_counter()
+                builder.mdx_lookup_many(words)
+                report(f"{name}, batch", time.perf_counter() - start, len(words))
+
+
+def bench_bloom(args: argparse.Namespace) -> None:
+    """Normalized lookups of missing words: tiered SQL query vs Bloom filter rejection"""
+    from mdict_query import IndexBuilder
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = write_mdx(Path(tmp) / "bench.mdx", sample_entries(args.entries))
+        words = pick_words(args.entries, args.words)
+        misses = [f"missing-{i}" for i in range(args.words)]
+        print(f"bloom: {args.entries} entries, {len(words)} words (10% misses)")
+        IndexBuilder(str(mdx_file)).close()
+        for name, error_rate in (("SQL only (before)", None), ("Bloom filter (after)", 0.01)):
+            start = time.perf_counter()
+            builder = IndexBuilder(str(mdx_file), bloom_error_rate=error_rate)
+            print(f"  {name:<28} open {(time.perf_counter() - start) * 1e3:9.1f} ms")
+            with builder:
+                for label, sample in (("misses", misses), ("10% misses", words)):
+                    start = time.perf_counter()
+                    for word in sample:
+                        builder.mdx_lookup_normalized(word)
+                    report(f"{name}, {label}", time.perf_counter() - start, len(sample))
+                start = time.perf_counter()
+                builder.mdx_lookup_normalized_many(words)
+                report(f"{name}, batch", time.perf_counter() - start, len(words))
+                stats = builder.bloom_filter_stats()
+                if stats:
+                    print(
+                        f"  filter: {stats['bytes'] / 1024:.0f} KiB, {stats['hashes']} hashes, "
+                        f"{stats['false_positives']} false positives in {stats['probes']} probes"
+                    )
+
+
+def bench_bulk(args: argparse.Namespace) -> None:
+    """Index rows of a huge batch: IN (...) query per 999 words vs one temporary table join"""
+    import mdict_query
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = write_mdx(Path(tmp) / "bench.mdx", sample_entries(args.entries))
+        words = pick_words(args.entries, args.words)
+        print(f"bulk: {args.entries} entries, {len(words)} words (10% misses)")
+        with mdict_query.IndexBuilder(str(mdx_file)) as builder:
+            bulk_min = mdict_query.BULK_LOOKUP_MIN
+            for name, threshold in (("IN chunks (before)", len(words)), ("temp table (after)", 0)):
+                mdict_query.BULK_LOOKUP_MIN = threshold
+                for label, lookup in (
+                    ("exact", lambda: builder.lookup_indexes_many(builder._mdx_db, words)),
+                    (
+                        "ignorecase",
+                        lambda: builder.lookup_indexes_many(builder._mdx_db, words, True),
+                    ),
+                    (
+                        "normalized",
+                        lambda: builder.lookup_normalized_indexes_many(builder._mdx_db, words),
+                    ),
+                ):
+                    start = time.perf_counter()
+                    lookup()
+                    report(f"{name}, {label}", time.perf_counter() - start, len(words))
+            mdict_query.BULK_LOOKUP_MIN = bulk_min
+
+
+def bench_suggest(args: argparse.Namespace) -> None:
+    """Did-you-mean for misses: edit distance to every key vs the symmetric delete index"""
+    import mdict_query
+    from mdict_suggest import edit_distance
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = random.Random(7)
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        keys = sorted(
+            {"".join(rng.choices(letters, k=rng.randint(4, 12))) for _ in range(args.entries)}
+        )
+        entries = [(key, f"<p>{key}</p>") for key in keys]
+        mdx_file = write_mdx(Path(tmp) / "bench.mdx", entries, records_per_block=64)
+        # misspellings one or two edits away from a key
+        misses = []
+        for _ in range(args.words):
+            word = list(rng.choice(keys))
+            for _ in range(rng.randint(1, 2)):
+                i = rng.randrange(len(word))
+                word[i] = rng.choice(letters)
+            misses.append("".join(word))
+        print(f"suggest: {len(keys)} entries, {len(misses)} misspelled words")
+        with mdict_query.IndexBuilder(str(mdx_file)) as builder:
+            scan = misses[: max(1, len(misses) // 100)]
+            start = time.perf_counter()
+            mdx_keys = builder.get_mdx_keys()
+            for word in scan:
+                sorted((edit_distance(word, key, 2), key) for key in mdx_keys)
+            report("scan of get_mdx_keys (before)", time.perf_counter() - start, len(scan))
+
+            start = time.perf_counter()
+            builder.mdx_suggest_many(misses[:1])
+            print(f"  {'build .mdx.suggest':<28} {time.perf_counter() - start:10.3f} s")
+            size = os.path.getsize(os.path.splitext(builder._mdx_db)[0] + ".suggest")
+            print(f"  {'index size':<28} {size / 1024 / 1024:10.1f} MiB")
+
+            start = time.perf_counter()
+            builder.mdx_suggest_many(misses)
+            report("delete index (after)", time.perf_counter() - start, len(misses))
+
+
+def bench_verify(args: argparse.Namespace) -> None:
+    """Checked index build (check=True): serial verification vs a process pool"""
+    from mdict_query import IndexBuilder
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = write_mdx(
+            Path(tmp) / "bench.mdx", sample_entries(args.entries), records_per_block=256
+        )
+        workers = os.cpu_count() or 1
+        print(f"verify: {args.entries} entries, 256 records per block, {workers} CPU(s)")
+        for label, count in (("1 worker (before)", 1), (f"{workers} workers (after)", workers)):
+            start = time.perf_counter()
+            IndexBuilder(str(mdx_file), force_rebuild=True, check=True, workers=count).close()
+            print(f"  {label:<28} build {time.perf_counter() - start:7.2f}s")
+
+
+def split_key_block_bytewise(key_block, encoding, number_format, number_width):
+    """The previous MDict._split_key_block: a byte-by-byte delimiter scan per key"""
+    from struct import unpack
+
+    key_list = []
+    key_start_index = 0
+    delimiter, width = (b"\x00\x00", 2) if encoding == "UTF-16" else (b"\x00", 1)
+    while key_start_index < len(key_block):
+        key_id = unpack(number_format, key_block[key_start_index : key_start_index + number_width])[
+            0
+        ]
+        i = key_start_index + number_width
+        while i < len(key_block):
+            if key_block[i : i + width] == delimiter:
+                key_end_index = i
+                break
+            i += width
+        key_text = (
+            key_block[key_start_index + number_width : key_end_index]
+            .decode(encoding, errors="ignore")
+            .encode("utf-8")
+            .strip()
+        )
+        key_start_index = key_end_index + width
+        key_list += [(key_id, key_text)]
+    return key_list
+
+
+def bench_keys(args: argparse.Namespace) -> None:
+    """Key block decoding: byte-by-byte splitter vs bytes.find splitter vs process pool"""
+    import readmdict
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = write_mdx(
+            Path(tmp) / "bench.mdx", sample_entries(args.entries), keys_per_block=512
+        )
+        mdx = readmdict.MDX(str(mdx_file))
+        workers = os.cpu_count() or 1
+        blocks = len(mdx._key_block_info_list)
+        print(f"keys: {args.entries} keys in {blocks} key blocks, {workers} CPU(s)")
+
+        fmt = (mdx._encoding, mdx._number_format, mdx._number_width)
+        start = time.perf_counter()
+        count = sum(len(split_key_block_bytewise(b, *fmt)) for b in mdx._iter_key_blocks())
+        report("bytewise scan (before)", time.perf_counter() - start, count)
+
+        start = time.perf_counter()
+        count = sum(1 for _ in mdx._iter_keys(workers=1))
+        report("bytes.find (after)", time.perf_counter() - start, count)
+
+        start = time.perf_counter()
+        count = sum(1 for _ in mdx._iter_keys(workers=max(2, workers)))
+        report(f"bytes.find, {max(2, workers)} processes", time.perf_counter() - start, count)
+
+
+def bench_crypto(args: argparse.Namespace) -> None:
+    """Ciphers of encrypted dictionaries: pure Python vs NumPy"""
+    import readmdict
+    from pureSalsa20 import Salsa20
+
+    try:
+        import mdict_crypto
+    except ImportError:
+        sys.exit("crypto: NumPy is not installed")
+
+    rng = random.Random(42)
+    key, iv = rng.randbytes(16), b"\x00" * 8
+    cases = (
+        (
+            "key block info cipher",
+            rng.randbytes(1 << 20),
+            lambda data: readmdict._fast_decrypt_py(data, key),
+            lambda data: mdict_crypto.fast_decrypt(data, key),
+        ),
+        (
+            "Salsa20/8",
+            rng.randbytes(1 << 16),
+            lambda data: Salsa20(key=key, IV=iv, rounds=8).encryptBytes(data),
+            lambda data: mdict_crypto.salsa20_xor(data, key, iv, rounds=8),
+        ),
+    )
+    for label, data, before, after in cases:
+        print(f"crypto: {label}, {len(data) // 1024} KiB")
+        for name, fn in (("pure Python (before)", before), ("NumPy (after)", after)):
+            start = time.perf_counter()
+            fn(data)
+            seconds = time.perf_counter() - start
+            mib_s = len(data) / seconds / 2**20
+            print(f"  {name:<28} {seconds * 1e3:10.2f} ms   ({mib_s:8.1f} MiB/s)")
+
+
+VENDOR = ROOT / "src" / "mdxscraper" / "mdict" / "vendor"
+
+
+def load_original_lzo():
+    """The lzo.py first vendored with mdict-query, read from git history"""
+    path = (VENDOR / "lzo.py").relative_to(ROOT).as_posix()
+    try:
+        revision = subprocess.run(
+            ["git", "log", "--diff-filter=A", "--format=%H", "--", path],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()[-1]
+        source = subprocess.run(
+            ["git", "show", f"{revision}:{path}"], cwd=ROOT, capture_output=True, check=True
+        ).stdout
+    except (OSError, IndexError, subprocess.CalledProcessError):
+        return None
+    module = importlib.util.module_from_spec(importlib.util.spec_from_loader("lzo_original", None))
+    exec(compile(source, "lzo_original.py", "exec"), module.__dict__)
+    return module
+
+
+def load_python_lzo():
+    """python-lzo if installed; the vendored lzo.py shadows it on sys.path"""
+    path = [p for p in sys.path if Path(p or ".").resolve() != VENDOR]
+    spec = importlib.machinery.PathFinder.find_spec("lzo", path)
+    if spec is None:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_lzo(args: argparse.Namespace) -> None:
+    """LZO1X record blocks: original FlexBuffer decoder vs slice-copy decoder vs python-lzo"""
+    import lzo
+    from fixtures import lzo1x
+
+    records = b"".join(
+        f"<div class='def'>{html}</div>\n".encode() for _, html in sample_entries(args.entries)
+    )
+    blocks = [records[i : i + (1 << 16)] for i in range(0, len(records), 1 << 16)]
+    compressed = [(lzo1x.compress(block), len(block)) for block in blocks]
+    print(f"lzo: {len(records) // 1024} KiB of records in {len(blocks)} blocks of 64 KiB")
+
+    decoders = [("slice copies (after)", lambda data, size: lzo.decompress(data, initSize=size))]
+    original = load_original_lzo()
+    if original is not None:
+        decoders.insert(
+            0,
+            (
+                "FlexBuffer (before)",
+                lambda data, size: original.decompress(data, initSize=size, blockSize=1308672),
+            ),
+        )
+    python_lzo = load_python_lzo()
+    if python_lzo is not None:
+        decoders.append(("python-lzo", lambda data, size: python_lzo.decompress(data, False, size)))
+    else:
+        print("  (python-lzo is not installed)")
+
+    for name, decode in decoders:
+        start = time.perf_counter()
+        for (data, size), block in zip(compressed, blocks):
+            assert decode(data, size) == block
+        seconds = time.perf_counter() - start
+        mib_s = len(records) / seconds / 2**20
+        print(f"  {name:<28} {seconds * 1e3:10.2f} ms   ({mib_s:8.1f} MiB/s)")
+
+
+def bench_volumes(args: argparse.Namespace) -> None:
+    """Index build of a 4-volume .mdd: volumes one after another vs one process per volume"""
+    from mdict_query import IndexBuilder
+
+    volumes = 4
+    with tempfile.TemporaryDirectory() as tmp:
+        mdx_file = write_mdx(Path(tmp) / "bench.mdx", sample_entries(100))
+        for volume in range(volumes):
+            suffix = f".{volume}.mdd" if volume else ".mdd"
+            resources = [
+                (f"\\img\\v{volume}-{i:07d}.png", b"\x89PNG" + os.urandom(64))
+                for i in range(args.entries)
+            ]
+            write_mdd(Path(tmp) / f"bench{suffix}", resources, records_per_block=64)
+        print(f"volumes: {volumes} .mdd volumes of {args.entries} resources, {os.cpu_count()} CPUs")
+        for name, workers in (("serial (before)", 1), ("per-volume workers (after)", volumes)):
+            start = time.perf_counter()
+            IndexBuilder(str(mdx_file), force_rebuild=True, workers=workers).close()
+            print(f"  {name:<28} build {time.perf_counter() - start:7.2f}s")
+
+
+BENCHMARKS = {
+    "lookup": bench_lookup,
+    "batch": bench_batch,
+    "binary": bench_binary,
+    "bloom": bench_bloom,
+    "bulk": bench_bulk,
+    "crypto": bench_crypto,
+    "fallback": bench_fallback,
+    "keys": bench_keys,
+    "lemma": bench_lemma,
+    "links": bench_links,
+    "lzo": bench_lzo,
+    "partial": bench_partial,
+    "pragmas": bench_pragmas,
+    "schema": bench_schema,
+    "sparse": bench_sparse,
+    "suggest": bench_suggest,
+    "verify": bench_verify,
+    "volumes": bench_volumes,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmark", nargs="?", default="lookup", choices=sorted(BENCHMARKS))
+    parser.add_argument("--entries", type=int, default=20000, help="headwords in the dictionary")
+    parser.add_argument("--words", type=int, default=2000, help="words to look up")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
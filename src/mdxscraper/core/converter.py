@@ -21,6 +21,15 @@ from mdxscraper.utils.path_utils import (
 )
 
 
+class InvalidWord(str):
+    """A word not found in the dictionary, with the keys suggested in its place"""
+
+    def __new__(cls, word: str, suggestions: list[str]):
+        invalid_word = super().__new__(cls, word)
+        invalid_word.suggestions = suggestions
+        return invalid_word
+
+
 def mdx2html(
     mdx_file: str | Path,
     input_file: str | Path,
@@ -29,101 +38,181 @@ def mdx2html(
     h1_style: str | None = None,
     scrap_style: str | None = None,
     additional_styles: str | None = None,
+    index_options: dict | None = None,
     progress_callback: Optional[Callable[[int, str], None]] = None,
+    log_callback: Optional[Callable[[str], None]] = None,
+    lemma_fallback: bool = False,
+    suggestions: int = 0,
+    suggestions_in_output: bool = False,
 ) -> Tuple[int, int, OrderedDict]:
     found_count = 0
     not_found_count = 0
 
     mdx_file = Path(mdx_file)
-    dictionary = Dictionary(mdx_file)
-    lessons = WordParser(str(input_file)).parse()
 
-    if progress_callback:
-        progress_callback(5, "Loading dictionary and parsing input...")
+    # the .mdx and each .mdd volume report their own blocks, so keep the highest
+    # percentage reached: the bar never goes back for the next file
+    index_percent = 0
 
-    right_soup = BeautifulSoup(
-        '<body style="font-family:Arial Unicode MS;"><div class="right"></div></body>', "lxml"
-    )
-    right_soup.find("body").insert_before("\n")
-    left_soup = BeautifulSoup('<div class="left"></div>', "lxml")
+    def index_progress(file_name: str, done: int, total: int) -> None:
+        # Only called while the dictionary index is (re)built
+        nonlocal index_percent
+        if progress_callback:
+            index_percent = max(index_percent, 5 * done // total)
+            progress_callback(
+                index_percent, f"Indexing {Path(file_name).name}: block {done}/{total}"
+            )
 
-    invalid_words = OrderedDict()
-    total_lessons = len(lessons)
-    processed_lessons = 0
+    dictionary = Dictionary(mdx_file, progress_callback=index_progress, **(index_options or {}))
+    try:
+        lessons = WordParser(str(input_file)).parse()
 
-    for lesson in lessons:
         if progress_callback:
-            progress = 10 + int((processed_lessons / total_lessons) * 60)
-            progress_callback(progress, f"Processing lesson: {lesson['name']}")
-
-        h1 = right_soup.new_tag("h1", id="lesson_" + lesson["name"])
-        if h1_style:
-            h1["style"] = h1_style
-        h1.string = lesson["name"]
-        right_soup.div.append(h1)
-
-        a = left_soup.new_tag("a", href="#lesson_" + lesson["name"], **{"class": "lesson"})
-        a.string = lesson["name"]
-        left_soup.div.append(a)
-        left_soup.div.append(left_soup.new_tag("br"))
-        left_soup.div.append("\n")
-
-        invalid = False
-        for word in lesson["words"]:
-            result = dictionary.lookup_html(word)
-            if len(result) == 0:
-                not_found_count += 1
-                # Always collect invalid words and embed a warning
-                if lesson["name"] in invalid_words:
-                    invalid_words[lesson["name"]].append(word)
-                else:
-                    invalid_words[lesson["name"]] = [word]
-                invalid = True
-                # result = '<div style="padding:0 0 15px 0"><b>WARNING:</b> "' + word + '" not found</div>'
-            else:
-                found_count += 1
-
-            definition = BeautifulSoup(result, "lxml")
-            if right_soup.head is None and definition.head is not None:
-                right_soup.html.insert_before(definition.head)
-                right_soup.head.append(right_soup.new_tag("meta", charset="utf-8"))
-
-            new_div = right_soup.new_tag("div")
-            if scrap_style:
-                new_div["style"] = scrap_style
-            new_div["id"] = "word_" + word
-            new_div["class"] = "scrapedword"
-            if definition.body:
-                new_div.append(definition.body)
-            right_soup.div.append("\n")
-            right_soup.div.append(new_div)
-
-            a = left_soup.new_tag(
-                "a",
-                href="#word_" + word,
-                **{"class": "word" + (" invalid_word" if invalid else "")},
-            )
-            invalid = False
-            a.string = word
+            progress_callback(5, "Loading dictionary and parsing input...")
+
+        right_soup = BeautifulSoup(
+            '<body style="font-family:Arial Unicode MS;"><div class="right"></div></body>', "lxml"
+        )
+        right_soup.find("body").insert_before("\n")
+        left_soup = BeautifulSoup('<div class="left"></div>', "lxml")
+
+        # Look up every word in one batch so each record block is decompressed only once
+        all_words = [word for lesson in lessons for word in lesson["words"]]
+        if progress_callback:
+            progress_callback(8, f"Looking up {len(all_words)} words...")
+        definitions = dictionary.lookup_html_many(all_words)
+        # Words found only through their lemma: position in all_words -> lemma
+        lemmas = {}
+        if lemma_fallback:
+            missing = [i for i, definition in enumerate(definitions) if not definition]
+            if missing:
+                found = dictionary.lookup_lemma_many([all_words[i] for i in missing])
+                for i, (lemma, definition) in zip(missing, found):
+                    if definition:
+                        definitions[i] = definition
+                        lemmas[i] = lemma
+            if log_callback and lemmas:
+                examples = ", ".join(
+                    f"{all_words[i]} → {lemma}" for i, lemma in list(lemmas.items())[:5]
+                )
+                more = f" and {len(lemmas) - 5} more" if len(lemmas) > 5 else ""
+                log_callback(f"🔤 Lemma fallback: {len(lemmas)} words found as {examples}{more}")
+        # "Did you mean" keys of words still not found: position in all_words -> keys
+        suggested = {}
+        if suggestions > 0:
+            missing = [i for i, definition in enumerate(definitions) if not definition]
+            if missing:
+                found = dictionary.suggest_many([all_words[i] for i in missing], limit=suggestions)
+                suggested = {i: keys for i, keys in zip(missing, found) if keys}
+            if log_callback and suggested:
+                log_callback(
+                    f"💡 Suggestions: found for {len(suggested)} of {len(missing)} words not found"
+                )
+        definitions = iter(enumerate(definitions))
+        if log_callback:
+            bloom = dictionary.impl.bloom_filter_stats()
+            if bloom.get("probes"):
+                log_callback(
+                    f"🔎 Bloom filter: {bloom['rejected']} of {bloom['probes']} lookups rejected "
+                    f"without a query ({bloom['rejected'] / bloom['probes']:.1%}), "
+                    f"{bloom['false_positives']} false positives"
+                )
+
+        invalid_words = OrderedDict()
+        total_lessons = len(lessons)
+        processed_lessons = 0
+
+        for lesson in lessons:
+            if progress_callback:
+                progress = 10 + int((processed_lessons / total_lessons) * 60)
+                progress_callback(progress, f"Processing lesson: {lesson['name']}")
+
+            h1 = right_soup.new_tag("h1", id="lesson_" + lesson["name"])
+            if h1_style:
+                h1["style"] = h1_style
+            h1.string = lesson["name"]
+            right_soup.div.append(h1)
+
+            a = left_soup.new_tag("a", href="#lesson_" + lesson["name"], **{"class": "lesson"})
+            a.string = lesson["name"]
             left_soup.div.append(a)
             left_soup.div.append(left_soup.new_tag("br"))
             left_soup.div.append("\n")
 
-        left_soup.div.append(left_soup.new_tag("br"))
-        processed_lessons += 1
+            invalid = False
+            for word in lesson["words"]:
+                position, result = next(definitions)
+                lemma = lemmas.get(position)
+                if len(result) == 0:
+                    not_found_count += 1
+                    if position in suggested:
+                        word = InvalidWord(word, suggested[position])
+                    # Always collect invalid words and embed a warning
+                    if lesson["name"] in invalid_words:
+                        invalid_words[lesson["name"]].append(word)
+                    else:
+                        invalid_words[lesson["name"]] = [word]
+                    invalid = True
+                    # result = '<div style="padding:0 0 15px 0"><b>WARNING:</b> "' + word + '" not found</div>'
+                else:
+                    found_count += 1
+
+                definition = BeautifulSoup(result, "lxml")
+                if right_soup.head is None and definition.head is not None:
+                    right_soup.html.insert_before(definition.head)
+                    right_soup.head.append(right_soup.new_tag("meta", charset="utf-8"))
+
+                new_div = right_soup.new_tag("div")
+                if scrap_style:
+                    new_div["style"] = scrap_style
+                new_div["id"] = "word_" + word
+                new_div["class"] = "scrapedword"
+                if definition.body:
+                    new_div.append(definition.body)
+                if suggestions_in_output and position in suggested:
+                    p = right_soup.new_tag("p", **{"class": "suggestions"})
+                    p.string = f"{word}: did you mean {', '.join(suggested[position])}?"
+                    new_div.append(p)
+                right_soup.div.append("\n")
+                right_soup.div.append(new_div)
+
+                a = left_soup.new_tag(
+                    "a",
+                    href="#word_" + word,
+                    **{
+                        "class": "word"
+                        + (" invalid_word" if invalid else "")
+                        + (" lemma_word" if lemma else "")
+                    },
+                )
+                if lemma:
+                    a["title"] = lemma
+                elif position in suggested:
+                    a["title"] = ", ".join(suggested[position])
+                invalid = False
+                a.string = word
+                left_soup.div.append(a)
+                left_soup.div.append(left_soup.new_tag("br"))
+                left_soup.div.append("\n")
 
-    if with_toc:
-        main_div = right_soup.new_tag("div", **{"class": "main"})
-        right_soup.div.wrap(main_div)
-        right_soup.div.insert_before(left_soup.div)
+            left_soup.div.append(left_soup.new_tag("br"))
+            processed_lessons += 1
 
-    if progress_callback:
-        progress_callback(75, "Merging CSS styles...")
-    right_soup = merge_css(right_soup, mdx_file.parent, dictionary.impl, additional_styles)
+        if with_toc:
+            main_div = right_soup.new_tag("div", **{"class": "main"})
+            right_soup.div.wrap(main_div)
+            right_soup.div.insert_before(left_soup.div)
 
-    if progress_callback:
-        progress_callback(85, "Embedding images...")
-    right_soup = embed_images(right_soup, dictionary.impl)
+        if progress_callback:
+            progress_callback(75, "Merging CSS styles...")
+        right_soup = merge_css(right_soup, mdx_file.parent, dictionary.impl, additional_styles)
+
+        if progress_callback:
+            progress_callback(85, "Embedding images...")
+        right_soup = embed_images(right_soup, dictionary.impl)
+    finally:
+        # release the index connections and mapped files even if a step fails
+        dictionary.close()
 
     if progress_callback:
         progress_callback(90, "Writing HTML file...")
@@ -150,8 +239,13 @@ def mdx2pdf(
     h1_style: str | None = None,
     scrap_style: str | None = None,
     additional_styles: str | None = None,
+    index_options: dict | None = None,
     wkhtmltopdf_path: str = "auto",
     progress_callback: Optional[Callable[[int, str], None]] = None,
+    log_callback: Optional[Callable[[str], None]] = None,
+    lemma_fallback: bool = False,
+    suggestions: int = 0,
+    suggestions_in_output: bool = False,
 ) -> tuple[int, int, OrderedDict]:
     with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as temp:
         temp_file = temp.name
@@ -170,7 +264,12 @@ def mdx2pdf(
             h1_style=h1_style,
             scrap_style=scrap_style,
             additional_styles=additional_styles,
+            index_options=index_options,
             progress_callback=html_progress_callback,
+            log_callback=log_callback,
+            lemma_fallback=lemma_fallback,
+            suggestions=suggestions,
+            suggestions_in_output=suggestions_in_output,
         )
 
     # Validate wkhtmltopdf path before conversion
@@ -205,7 +304,12 @@ def mdx2img(
     h1_style: str | None = None,
     scrap_style: str | None = None,
     additional_styles: str | None = None,
+    index_options: dict | None = None,
     progress_callback: Optional[Callable[[int, str], None]] = None,
+    log_callback: Optional[Callable[[str], None]] = None,
+    lemma_fallback: bool = False,
+    suggestions: int = 0,
+    suggestions_in_output: bool = False,
 ) -> tuple[int, int, OrderedDict]:
     """Render dictionary results to an image using wkhtmltoimage via imgkit.
 
@@ -229,7 +333,12 @@ def mdx2img(
             h1_style=h1_style,
             scrap_style=scrap_style,
             additional_styles=additional_styles,
+            index_options=index_options,
             progress_callback=html_progress_callback,
+            log_callback=log_callback,
+            lemma_fallback=lemma_fallback,
+            suggestions=suggestions,
+            suggestions_in_output=suggestions_in_output,
         )
 
     # Ensure output directory exists
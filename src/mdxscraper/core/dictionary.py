@@ -2,44 +2,102 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from mdxscraper.core.lemmatizer import lemma_candidates
 from mdxscraper.mdict.mdict_query import IndexBuilder
 
+LINK_PREFIX = "@@@LINK="
+
 
 class Dictionary:
-    def __init__(self, mdx_file: Path | str):
+    def __init__(self, mdx_file: Path | str, **index_options):
+        """index_options 原样传给 IndexBuilder，如 block_cache_size"""
         self.mdx_path = Path(mdx_file)
-        self._impl = IndexBuilder(self.mdx_path)
+        self._impl = IndexBuilder(self.mdx_path, **index_options)
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        # 清理资源，如关闭数据库连接
-        # IndexBuilder 内部会管理自己的资源清理
-        pass
+        self.close()
+
+    def close(self) -> None:
+        """关闭 IndexBuilder 持有的索引数据库连接"""
+        self._impl.close()
 
     def _lookup_with_fallback(self, word: str) -> str:
-        """查找词条，包含多种回退策略"""
-        definitions = self._impl.mdx_lookup(word)
-        if len(definitions) == 0:
-            definitions = self._impl.mdx_lookup(word, ignorecase=True)
-        if len(definitions) == 0:
-            definitions = self._impl.mdx_lookup(word.replace("-", ""), ignorecase=True)
+        """查找词条，包含多种回退策略
+
+        精确匹配优先，其次依次为忽略大小写、忽略连字符/空格、忽略变音符号；
+        各层都由索引中预先计算的规范化键承担，只需一次索引查询。
+        """
+        definitions = self._impl.mdx_lookup_normalized(word)
         if len(definitions) == 0:
             return ""
         return definitions[0].strip()
 
+    def _lookup_many_with_fallback(self, words: list[str]) -> list[str]:
+        """批量查找词条，回退策略与 _lookup_with_fallback 相同"""
+        found = self._impl.mdx_lookup_normalized_many(words)
+        return [definitions[0].strip() if definitions else "" for definitions in found]
+
     def lookup_html(self, word: str) -> str:
-        word = word.strip()
-        definition = self._lookup_with_fallback(word)
-        if not definition:
-            return ""
+        definition = self._lookup_with_fallback(word.strip())
+        # @@@LINK 跳转已在建索引时解析到最终词条；稀疏/二进制索引等未解析的，
+        # 在这里逐跳跟随，遇到循环跳转则放弃
+        seen = set()
+        while definition.startswith(LINK_PREFIX):
+            linked_word = definition[len(LINK_PREFIX) :].strip()
+            if linked_word in seen:
+                return ""
+            seen.add(linked_word)
+            definition = self._lookup_with_fallback(linked_word)
+        return definition
+
+    def lookup_html_many(self, words: list[str]) -> list[str]:
+        """批量版 lookup_html，按输入顺序返回结果"""
+        words = [word.strip() for word in words]
+        definitions = self._lookup_many_with_fallback(words)
+
+        seen: dict[int, set[str]] = {}
+        links = [i for i, d in enumerate(definitions) if d.startswith(LINK_PREFIX)]
+        while links:
+            linked_words = {}
+            for i in links:
+                linked_word = definitions[i][len(LINK_PREFIX) :].strip()
+                if linked_word in seen.setdefault(i, set()):
+                    definitions[i] = ""
+                else:
+                    seen[i].add(linked_word)
+                    linked_words[i] = linked_word
+            if not linked_words:
+                break
+            found = self._lookup_many_with_fallback(list(linked_words.values()))
+            for i, definition in zip(linked_words, found):
+                definitions[i] = definition
+            links = [i for i in linked_words if definitions[i].startswith(LINK_PREFIX)]
+        return definitions
+
+    def lookup_lemma_many(self, words: list[str]) -> list[tuple[str, str]]:
+        """词形还原回退层：为查不到的屈折形式按规则生成候选原形（running -> run、geese -> goose）
+
+        所有词的候选一起对照索引中已有的词头（忽略大小写）查询一次，取每个词第一个存在的
+        候选。返回 (原形, 释义)，没有候选存在时为 ("", "")。
+        """
+        found = self._impl.mdx_lookup_first_many([lemma_candidates(word) for word in words])
+        results = []
+        for lemma, definitions in found:
+            definition = definitions[0].strip() if definitions else ""
+            if definition.startswith(LINK_PREFIX):
+                definition = self.lookup_html(definition[len(LINK_PREFIX) :])
+            results.append((lemma, definition) if definition else ("", ""))
+        return results
+
+    def suggest_many(self, words: list[str], limit: int = 5) -> list[list[str]]:
+        """为查不到的词给出拼写建议：编辑距离 1～2 以内的词头（忽略大小写），距离近的在前
 
-        if definition.startswith("@@@LINK="):
-            linked_word = definition.replace("@@@LINK=", "").strip()
-            return self._lookup_with_fallback(linked_word)
-        else:
-            return definition
+        由建在 .mdx.db 旁的对称删除索引（.mdx.suggest）回答，无需遍历全部词头。
+        """
+        return self._impl.mdx_suggest_many([word.strip() for word in words], limit=limit)
 
     @property
     def impl(self):
@@ -0,0 +1,210 @@
+"""基于规则的英语词形还原：为查不到的屈折形式（running、geese、analyses）生成候选原形"""
+
+from __future__ import annotations
+
+# 不规则形式 -> 原形
+IRREGULAR = {
+    # 名词复数
+    "children": "child",
+    "dice": "die",
+    "feet": "foot",
+    "geese": "goose",
+    "lice": "louse",
+    "men": "man",
+    "mice": "mouse",
+    "oxen": "ox",
+    "people": "person",
+    "teeth": "tooth",
+    "women": "woman",
+    # 形容词/副词比较级、最高级
+    "best": "good",
+    "better": "good",
+    "farther": "far",
+    "farthest": "far",
+    "further": "far",
+    "furthest": "far",
+    "least": "little",
+    "less": "little",
+    "more": "many",
+    "most": "many",
+    "worse": "bad",
+    "worst": "bad",
+    # 动词
+    "am": "be",
+    "are": "be",
+    "ate": "eat",
+    "been": "be",
+    "began": "begin",
+    "begun": "begin",
+    "bought": "buy",
+    "broke": "break",
+    "broken": "break",
+    "brought": "bring",
+    "built": "build",
+    "came": "come",
+    "caught": "catch",
+    "chose": "choose",
+    "chosen": "choose",
+    "did": "do",
+    "does": "do",
+    "done": "do",
+    "drank": "drink",
+    "drew": "draw",
+    "drawn": "draw",
+    "driven": "drive",
+    "drove": "drive",
+    "drunk": "drink",
+    "eaten": "eat",
+    "fell": "fall",
+    "fallen": "fall",
+    "felt": "feel",
+    "fought": "fight",
+    "found": "find",
+    "flew": "fly",
+    "flown": "fly",
+    "forgot": "forget",
+    "forgotten": "forget",
+    "gave": "give",
+    "given": "give",
+    "gone": "go",
+    "got": "get",
+    "gotten": "get",
+    "grew": "grow",
+    "grown": "grow",
+    "had": "have",
+    "has": "have",
+    "heard": "hear",
+    "held": "hold",
+    "is": "be",
+    "kept": "keep",
+    "knew": "know",
+    "known": "know",
+    "led": "lead",
+    "left": "leave",
+    "lent": "lend",
+    "lost": "lose",
+    "made": "make",
+    "meant": "mean",
+    "met": "meet",
+    "paid": "pay",
+    "ran": "run",
+    "rang": "ring",
+    "rode": "ride",
+    "rose": "rise",
+    "risen": "rise",
+    "said": "say",
+    "sang": "sing",
+    "sat": "sit",
+    "saw": "see",
+    "seen": "see",
+    "sent": "send",
+    "shook": "shake",
+    "shot": "shoot",
+    "slept": "sleep",
+    "sold": "sell",
+    "spent": "spend",
+    "spoke": "speak",
+    "spoken": "speak",
+    "stood": "stand",
+    "stole": "steal",
+    "stolen": "steal",
+    "sung": "sing",
+    "swam": "swim",
+    "taken": "take",
+    "taught": "teach",
+    "thought": "think",
+    "threw": "throw",
+    "thrown": "throw",
+    "told": "tell",
+    "took": "take",
+    "understood": "understand",
+    "was": "be",
+    "went": "go",
+    "were": "be",
+    "woke": "wake",
+    "woken": "wake",
+    "won": "win",
+    "wore": "wear",
+    "worn": "wear",
+    "written": "write",
+    "wrote": "write",
+}
+
+# (后缀, 替换) 按优先级排列；同一个词可匹配多条规则，每条都产生一个候选
+SUFFIX_RULES = (
+    # 名词复数
+    ("ies", "y"),  # studies -> study
+    ("ves", "f"),  # wolves -> wolf
+    ("ves", "fe"),  # knives -> knife
+    ("ices", "ex"),  # indices -> index
+    ("ices", "ix"),  # matrices -> matrix
+    ("sses", "ss"),  # classes -> class
+    ("ses", "sis"),  # analyses -> analysis
+    ("zzes", "z"),  # quizzes -> quiz
+    ("xes", "x"),  # boxes -> box
+    ("ches", "ch"),  # churches -> church
+    ("shes", "sh"),  # wishes -> wish
+    ("oes", "o"),  # potatoes -> potato
+    ("es", "e"),  # houses -> house
+    ("es", ""),  # buses -> bus
+    ("s", ""),  # cats -> cat
+    ("ae", "a"),  # larvae -> larva
+    ("i", "us"),  # cacti -> cactus
+    ("a", "um"),  # bacteria -> bacterium
+    ("men", "man"),  # firemen -> fireman
+    # 动词
+    ("ying", "ie"),  # lying -> lie
+    ("ing", ""),  # walking -> walk
+    ("ing", "e"),  # making -> make
+    ("ied", "y"),  # studied -> study
+    ("ed", ""),  # walked -> walk
+    ("ed", "e"),  # liked -> like
+    # 形容词比较级、最高级
+    ("iest", "y"),  # happiest -> happy
+    ("ier", "y"),  # happier -> happy
+    ("est", ""),  # tallest -> tall
+    ("est", "e"),  # nicest -> nice
+    ("er", ""),  # taller -> tall
+    ("er", "e"),  # nicer -> nice
+    # 副词
+    ("ically", "ic"),  # basically -> basic
+    ("ily", "y"),  # happily -> happy
+    ("ly", ""),  # quickly -> quick
+)
+
+# 去掉后会留下双写辅音的后缀：running -> runn -> run
+_DOUBLING_SUFFIXES = ("ing", "ed", "er", "est")
+_VOWELS = set("aeiou")
+
+# 候选原形的最短长度
+MIN_LEMMA_LENGTH = 2
+
+
+def lemma_candidates(word: str) -> list[str]:
+    """按可能性从高到低返回 word 的候选原形（小写、去重，不含 word 本身）
+
+    只做字符串变换，不判断候选是否存在；由调用方对照词典中已有的词头一次性筛选。
+    """
+    word = original = word.strip().casefold()
+    candidates = []
+    if word.endswith(("'s", "’s")):  # 所有格：dog's -> dog
+        word = word[:-2]
+        candidates.append(word)
+    if word in IRREGULAR:
+        candidates.append(IRREGULAR[word])
+    for suffix, replacement in SUFFIX_RULES:
+        if not word.endswith(suffix):
+            continue
+        stem = word[: -len(suffix)]
+        if not stem or len(stem) + len(replacement) < MIN_LEMMA_LENGTH:
+            continue
+        candidates.append(stem + replacement)
+        if (
+            not replacement
+            and suffix in _DOUBLING_SUFFIXES
+            and len(stem) >= 3
+            and stem[-1] == stem[-2]
+            and stem[-1] not in _VOWELS
+        ):
+            candidates.append(stem[:-1])
+    return [c for c in dict.fromkeys(candidates) if c != original]
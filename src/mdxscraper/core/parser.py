@@ -9,6 +9,8 @@ from typing import Any, Dict, List
 import openpyxl
 from chardet import detect
 
+from mdxscraper.utils.file_utils import SUGGESTIONS_MARKER
+
 
 class WordParser:
     """统一的单词解析器接口，提供面向对象的文件解析方式"""
@@ -60,7 +62,8 @@ class WordParser:
                 if len(result) == 0:
                     currentTime = datetime.now().strftime("%Y%m%d-%H%M%S")
                     result.append({"name": currentTime, "words": []})
-                result[-1]["words"].append(line)
+                # 无效词文件中词后附的拼写建议不属于单词
+                result[-1]["words"].append(line.partition(SUGGESTIONS_MARKER)[0])
         return result
 
     def _parse_xls(self) -> List[Dict[str, Any]]:
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 """mdict-query wrapper.
 
-Adds the vendored mdict-query directory to sys.path and imports the upstream
-module unchanged, so we can sync vendor code without edits.
+Adds the vendored mdict-query directory to sys.path and imports the module
+from there. The vendored copy carries local changes (e.g. pooled index
+connections), so upstream syncs must be merged rather than copied over.
 """
 
 import sys
@@ -14,9 +15,11 @@ _vendor_dir = Path(__file__).resolve().parent / "vendor"
 if str(_vendor_dir) not in sys.path:
     sys.path.insert(0, str(_vendor_dir))
 
+import mdict_cache as _mdict_cache  # type: ignore
 import mdict_query as _mdict_query  # type: ignore
 
 # Re-export stable API
 IndexBuilder = _mdict_query.IndexBuilder  # noqa: N816 (preserve original name)
+BlockCache = _mdict_cache.BlockCache
 
-__all__ = ["IndexBuilder"]
+__all__ = ["IndexBuilder", "BlockCache"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
@@ -46,6 +47,51 @@ class ExportService:
             opts["webp_lossless"] = bool(cm.get("image.webp.lossless", False))
         return opts
 
+    def build_index_options(self) -> Dict[str, Any]:
+        """IndexBuilder options: SQLite profiles, workers, Bloom filter, index cache (advanced.*)"""
+        options: Dict[str, Any] = {}
+        try:
+            workers = int(self.settings.get("advanced.index_workers", 1) or 0)
+        except (TypeError, ValueError):
+            workers = 1
+        if workers != 1:
+            options["workers"] = workers if workers > 1 else os.cpu_count() or 1
+        for key in ("build_profile", "read_profile"):
+            profile = self.settings.get(f"advanced.index_{key}", "")
+            if profile:
+                options[key] = str(profile)
+        try:
+            error_rate = float(self.settings.get("advanced.bloom_filter_error_rate", 0) or 0)
+            size_mb = int(self.settings.get("advanced.bloom_filter_size_mb", 0) or 0)
+        except (TypeError, ValueError):
+            error_rate, size_mb = 0.0, 0
+        if 0 < error_rate < 1:
+            options["bloom_error_rate"] = error_rate
+            options["bloom_max_size"] = size_mb * 1024 * 1024 if size_mb > 0 else None
+        cache_dir = self.settings.get("advanced.index_cache_dir", "")
+        if not cache_dir:
+            return options
+        try:
+            size_mb = int(self.settings.get("advanced.index_cache_size_mb", 0) or 0)
+        except (TypeError, ValueError):
+            size_mb = 0
+        options["index_dir"] = str(self.settings.resolve_path(cache_dir))
+        options["index_cache_size"] = size_mb * 1024 * 1024 if size_mb > 0 else None
+        return options
+
+    def build_suggestion_options(self) -> Dict[str, Any]:
+        """ "Did you mean" suggestions for words not found (advanced.suggestions*)"""
+        try:
+            count = int(self.settings.get("advanced.suggestions", 0) or 0)
+        except (TypeError, ValueError):
+            count = 0
+        return {
+            "suggestions": max(count, 0),
+            "suggestions_in_output": bool(
+                self.settings.get("advanced.suggestions_in_output", False)
+            ),
+        }
+
     def parse_css_styles(self, css_text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         return self.presets.parse_css_preset(css_text)
 
@@ -58,11 +104,15 @@ class ExportService:
         css_text: str = "",
         settings_service: Optional[SettingsService] = None,
         progress_callback: Optional[Callable[[int, str], None]] = None,
+        log_callback: Optional[Callable[[str], None]] = None,
     ) -> Tuple[int, int, List[str]]:
         from mdxscraper.core.converter import mdx2html, mdx2img, mdx2pdf
 
         suffix = output_path.suffix.lower()
         h1_style, scrap_style, additional_styles = self.parse_css_styles(css_text)
+        index_options = self.build_index_options()
+        lemma_fallback = bool(self.settings.get("advanced.lemma_fallback", False))
+        suggestion_options = self.build_suggestion_options()
 
         if suffix == ".html":
             with_toc = settings_service.get("basic.with_toc", True)
@@ -74,7 +124,11 @@ class ExportService:
                 h1_style=h1_style,
                 scrap_style=scrap_style,
                 additional_styles=additional_styles,
+                index_options=index_options,
                 progress_callback=progress_callback,
+                log_callback=log_callback,
+                lemma_fallback=lemma_fallback,
+                **suggestion_options,
             )
         elif suffix == ".pdf":
             pdf_options = self.build_pdf_options(pdf_text)
@@ -89,8 +143,12 @@ class ExportService:
                 h1_style=h1_style,
                 scrap_style=scrap_style,
                 additional_styles=additional_styles,
+                index_options=index_options,
                 wkhtmltopdf_path=wkhtmltopdf_path,
                 progress_callback=progress_callback,
+                log_callback=log_callback,
+                lemma_fallback=lemma_fallback,
+                **suggestion_options,
             )
         elif suffix in (".jpg", ".jpeg", ".png", ".webp"):
             img_opts = self.build_image_options(suffix)
@@ -104,7 +162,11 @@ class ExportService:
                 h1_style=h1_style,
                 scrap_style=scrap_style,
                 additional_styles=additional_styles,
+                index_options=index_options,
                 progress_callback=progress_callback,
+                log_callback=log_callback,
+                lemma_fallback=lemma_fallback,
+                **suggestion_options,
             )
         else:
             raise RuntimeError(f"Unsupported output extension: {suffix}")
@@ -3,10 +3,16 @@
 from collections import OrderedDict
 from pathlib import Path
 
+# Written after a word with suggestions; WordParser drops it when reading the file back
+SUGGESTIONS_MARKER = "  # did you mean: "
+
 
 def write_invalid_words_file(invalid_words: OrderedDict, output_file: str | Path) -> None:
     """Write invalid words to a text file in the same format as input files.
 
+    Words carrying suggestions (see converter.InvalidWord) are followed by them as
+    a trailing ``# did you mean: ...`` comment, which the parser ignores.
+
     Args:
         invalid_words: Dictionary mapping lesson names to lists of invalid words
         output_file: Path to the output file
@@ -21,7 +27,11 @@ def write_invalid_words_file(invalid_words: OrderedDict, output_file: str | Path
         for lesson_name, words in invalid_words.items():
             f.write(f"# {lesson_name}\n")
             for word in words:
-                f.write(f"{word}\n")
+                suggestions = getattr(word, "suggestions", None)
+                if suggestions:
+                    f.write(f"{word}{SUGGESTIONS_MARKER}{', '.join(suggestions)}\n")
+                else:
+                    f.write(f"{word}\n")
             f.write("\n")
 
 
@@ -86,6 +86,7 @@ class ConversionWorker(QThread):
                 css_text=self._css_text or "",
                 settings_service=self._settings_service,
                 progress_callback=progress_callback,
+                log_callback=self.log_sig.emit,
             )
 
             # Backup input file to output directory if enabled
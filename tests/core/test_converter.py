@@ -8,6 +8,11 @@ import pytest
 from mdxscraper.core.converter import mdx2html, mdx2img, mdx2pdf
 
 
+def _lookup_all(definition):
+    """Side effect for Dictionary.lookup_html_many returning one definition per word"""
+    return lambda words: [definition] * len(words)
+
+
 def test_mdx2html_basic():
     """Test basic HTML conversion"""
     mdx_file = Path("test.mdx")
@@ -22,7 +27,7 @@ def test_mdx2html_basic():
 
     # Mock dictionary lookup results
     mock_dictionary = Mock()
-    mock_dictionary.lookup_html.return_value = "<html>definition</html>"
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
@@ -40,6 +45,50 @@ def test_mdx2html_basic():
                         assert len(invalid_words) == 0
 
 
+def test_mdx2html_closes_dictionary_on_error():
+    """Test that the dictionary is closed when a step of the conversion fails"""
+    mock_dictionary = Mock()
+    mock_dictionary.lookup_html_many.side_effect = RuntimeError("lookup failed")
+
+    with patch("mdxscraper.core.converter.WordParser") as mock_parser:
+        with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
+            mock_parser.return_value.parse.return_value = [{"name": "Lesson 1", "words": ["a"]}]
+            with pytest.raises(RuntimeError, match="lookup failed"):
+                mdx2html(Path("test.mdx"), Path("test.txt"), Path("output.html"))
+
+    mock_dictionary.close.assert_called_once()
+
+
+def test_mdx2html_logs_bloom_filter_stats():
+    """Test that the Bloom filter hit rate is reported through log_callback"""
+    lessons = [{"name": "Lesson 1", "words": ["word1", "word2"]}]
+    mock_dictionary = Mock()
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
+    mock_dictionary.impl.bloom_filter_stats.return_value = {
+        "probes": 8,
+        "rejected": 2,
+        "false_positives": 1,
+    }
+    logs = []
+
+    with patch("mdxscraper.core.converter.WordParser") as mock_parser:
+        with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
+            with patch("mdxscraper.core.converter.merge_css", return_value="merged_css"):
+                with patch("mdxscraper.core.converter.embed_images", return_value="embedded_html"):
+                    with patch("builtins.open", mock_open()):
+                        mock_parser.return_value.parse.return_value = lessons
+                        mdx2html(
+                            Path("test.mdx"),
+                            Path("test.txt"),
+                            Path("output.html"),
+                            log_callback=logs.append,
+                        )
+
+    assert logs == [
+        "🔎 Bloom filter: 2 of 8 lookups rejected without a query (25.0%), 1 false positives"
+    ]
+
+
 def test_mdx2html_with_not_found_words():
     """Test HTML conversion with some words not found"""
     mdx_file = Path("test.mdx")
@@ -56,7 +105,9 @@ def test_mdx2html_with_not_found_words():
             return "<html>definition</html>"
         return ""
 
-    mock_dictionary.lookup_html.side_effect = lookup_side_effect
+    mock_dictionary.lookup_html_many.side_effect = lambda words: [
+        lookup_side_effect(word) for word in words
+    ]
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
@@ -76,6 +127,96 @@ def test_mdx2html_with_not_found_words():
                         assert "word2" in invalid_words["Lesson 1"]
 
 
+def test_mdx2html_lemma_fallback():
+    """Test that words not found but found by their lemma count as found"""
+    lessons = [{"name": "Lesson 1", "words": ["word1", "running", "xyzzy"]}]
+    mock_dictionary = Mock()
+    mock_dictionary.lookup_html_many.side_effect = lambda words: [
+        "<html>definition</html>" if word == "word1" else "" for word in words
+    ]
+    mock_dictionary.lookup_lemma_many.return_value = [
+        ("run", "<html>run</html>"),
+        ("", ""),
+    ]
+    mock_dictionary.impl.bloom_filter_stats.return_value = {}
+    logs = []
+
+    with patch("mdxscraper.core.converter.WordParser") as mock_parser:
+        with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
+            with patch("mdxscraper.core.converter.merge_css", return_value="merged_css"):
+                with patch("mdxscraper.core.converter.embed_images", return_value="embedded_html"):
+                    with patch("builtins.open", mock_open()):
+                        mock_parser.return_value.parse.return_value = lessons
+                        found, not_found, invalid_words = mdx2html(
+                            Path("test.mdx"),
+                            Path("test.txt"),
+                            Path("output.html"),
+                            log_callback=logs.append,
+                            lemma_fallback=True,
+                        )
+
+    mock_dictionary.lookup_lemma_many.assert_called_once_with(["running", "xyzzy"])
+    assert (found, not_found) == (2, 1)
+    assert invalid_words == {"Lesson 1": ["xyzzy"]}
+    assert logs == ["🔤 Lemma fallback: 1 words found as running → run"]
+
+
+def test_mdx2html_suggestions():
+    """Test that words not found carry suggestions, also into the output if asked"""
+    lessons = [{"name": "Lesson 1", "words": ["word1", "colr", "xyzzy"]}]
+    mock_dictionary = Mock()
+    mock_dictionary.lookup_html_many.side_effect = lambda words: [
+        "<html>definition</html>" if word == "word1" else "" for word in words
+    ]
+    mock_dictionary.suggest_many.return_value = [["color", "colour"], []]
+    mock_dictionary.impl.bloom_filter_stats.return_value = {}
+    logs = []
+
+    with patch("mdxscraper.core.converter.WordParser") as mock_parser:
+        with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
+            with patch("mdxscraper.core.converter.merge_css", side_effect=lambda soup, *a: soup):
+                with patch("mdxscraper.core.converter.embed_images", side_effect=lambda s, d: s):
+                    with patch("builtins.open", mock_open()) as mock_file:
+                        mock_parser.return_value.parse.return_value = lessons
+                        found, not_found, invalid_words = mdx2html(
+                            Path("test.mdx"),
+                            Path("test.txt"),
+                            Path("output.html"),
+                            log_callback=logs.append,
+                            suggestions=2,
+                            suggestions_in_output=True,
+                        )
+
+    mock_dictionary.suggest_many.assert_called_once_with(["colr", "xyzzy"], limit=2)
+    assert (found, not_found) == (1, 2)
+    assert invalid_words == {"Lesson 1": ["colr", "xyzzy"]}
+    assert invalid_words["Lesson 1"][0].suggestions == ["color", "colour"]
+    assert not hasattr(invalid_words["Lesson 1"][1], "suggestions")
+    html = mock_file().write.call_args[0][0].decode("utf-8")
+    assert "colr: did you mean color, colour?" in html
+    assert logs == ["💡 Suggestions: found for 1 of 2 words not found"]
+
+
+def test_mdx2html_without_lemma_fallback():
+    """Test that the lemma fallback is off by default"""
+    lessons = [{"name": "Lesson 1", "words": ["running"]}]
+    mock_dictionary = Mock()
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("")
+
+    with patch("mdxscraper.core.converter.WordParser") as mock_parser:
+        with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
+            with patch("mdxscraper.core.converter.merge_css", return_value="merged_css"):
+                with patch("mdxscraper.core.converter.embed_images", return_value="embedded_html"):
+                    with patch("builtins.open", mock_open()):
+                        mock_parser.return_value.parse.return_value = lessons
+                        found, not_found, _ = mdx2html(
+                            Path("test.mdx"), Path("test.txt"), Path("output.html")
+                        )
+
+    mock_dictionary.lookup_lemma_many.assert_not_called()
+    assert (found, not_found) == (0, 1)
+
+
 def test_mdx2html_with_progress_callback():
     """Test HTML conversion with progress callback"""
     mdx_file = Path("test.mdx")
@@ -86,7 +227,7 @@ def test_mdx2html_with_progress_callback():
     lessons = [{"name": "Lesson 1", "words": ["word1"]}]
 
     mock_dictionary = Mock()
-    mock_dictionary.lookup_html.return_value = "<html>definition</html>"
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
@@ -103,6 +244,41 @@ def test_mdx2html_with_progress_callback():
                         assert progress_callback.call_count > 0
 
 
+def test_mdx2html_reports_index_build_progress():
+    """Index build progress is mapped onto the first 5% of the conversion"""
+    progress_callback = Mock()
+    mock_dictionary = Mock()
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
+
+    def build_index(mdx_file, progress_callback):
+        progress_callback(str(mdx_file), 50, 100)
+        progress_callback(str(mdx_file), 100, 100)
+        progress_callback("dict.mdd", 1, 4)
+        return mock_dictionary
+
+    with patch("mdxscraper.core.converter.WordParser") as mock_parser:
+        with patch("mdxscraper.core.converter.Dictionary", side_effect=build_index):
+            with patch("mdxscraper.core.converter.merge_css", return_value="merged_css"):
+                with patch("mdxscraper.core.converter.embed_images", return_value="embedded_html"):
+                    with patch("builtins.open", mock_open()):
+                        mock_parser.return_value.parse.return_value = [
+                            {"name": "Lesson 1", "words": ["word1"]}
+                        ]
+                        mdx2html(
+                            Path("dict.mdx"),
+                            Path("test.txt"),
+                            Path("output.html"),
+                            progress_callback=progress_callback,
+                        )
+
+    assert progress_callback.call_args_list[:3] == [
+        ((2, "Indexing dict.mdx: block 50/100"),),
+        ((5, "Indexing dict.mdx: block 100/100"),),
+        # the .mdd volumes start over from block 1, the bar does not
+        ((5, "Indexing dict.mdd: block 1/4"),),
+    ]
+
+
 def test_mdx2html_with_css_styles():
     """Test HTML conversion with CSS styles"""
     mdx_file = Path("test.mdx")
@@ -112,7 +288,7 @@ def test_mdx2html_with_css_styles():
     lessons = [{"name": "Lesson 1", "words": ["word1"]}]
 
     mock_dictionary = Mock()
-    mock_dictionary.lookup_html.return_value = "<html>definition</html>"
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
@@ -147,7 +323,9 @@ def test_mdx2html_with_mdd_file():
     lessons = [{"name": "Lesson 1", "words": ["word1"]}]
 
     mock_dictionary = Mock()
-    mock_dictionary.lookup_html.return_value = "<html>definition with <img src='test.png'></html>"
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all(
+        "<html>definition with <img src='test.png'></html>"
+    )
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
@@ -177,7 +355,7 @@ def test_mdx2pdf_basic():
     lessons = [{"name": "Lesson 1", "words": ["word1"]}]
 
     mock_dictionary = Mock()
-    mock_dictionary.lookup_html.return_value = "<html>definition</html>"
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
@@ -210,7 +388,7 @@ def test_mdx2pdf_wkhtmltopdf_error():
     lessons = [{"name": "Lesson 1", "words": ["word1"]}]
 
     mock_dictionary = Mock()
-    mock_dictionary.lookup_html.return_value = "<html>definition</html>"
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
@@ -235,7 +413,7 @@ def test_mdx2img_basic():
     lessons = [{"name": "Lesson 1", "words": ["word1"]}]
 
     mock_dictionary = Mock()
-    mock_dictionary.lookup_html.return_value = "<html>definition</html>"
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
@@ -272,7 +450,7 @@ def test_mdx2img_wkhtmltoimage_error():
     lessons = [{"name": "Lesson 1", "words": ["word1"]}]
 
     mock_dictionary = Mock()
-    mock_dictionary.lookup_html.return_value = "<html>definition</html>"
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
@@ -320,7 +498,7 @@ def test_mdx2html_with_backup():
     lessons = [{"name": "Lesson 1", "words": ["word1"]}]
 
     mock_dictionary = Mock()
-    mock_dictionary.lookup_html.return_value = "<html>definition</html>"
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
@@ -347,7 +525,7 @@ def test_mdx2html_with_timestamp():
     lessons = [{"name": "Lesson 1", "words": ["word1"]}]
 
     mock_dictionary = Mock()
-    mock_dictionary.lookup_html.return_value = "<html>definition</html>"
+    mock_dictionary.lookup_html_many.side_effect = _lookup_all("<html>definition</html>")
 
     with patch("mdxscraper.core.converter.WordParser") as mock_parser:
         with patch("mdxscraper.core.converter.Dictionary", return_value=mock_dictionary):
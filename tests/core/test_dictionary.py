@@ -38,24 +38,24 @@ def test_lookup_html_success():
     """Test successful HTML lookup"""
     mock_mdx_file = Path("test.mdx")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
-    mock_builder.mdx_lookup.return_value = ["<html>test result</html>"]
+    mock_builder.mdx_lookup_normalized.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = ["<html>test result</html>"]
 
     with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
         dictionary = Dictionary(mock_mdx_file)
         result = dictionary.lookup_html("test_word")
 
         assert result == "<html>test result</html>"
-        mock_builder.mdx_lookup.assert_called_once_with("test_word")
+        mock_builder.mdx_lookup_normalized.assert_called_once_with("test_word")
 
 
 def test_lookup_html_not_found():
     """Test HTML lookup when word not found"""
     mock_mdx_file = Path("test.mdx")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = []
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = []
 
     with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
         dictionary = Dictionary(mock_mdx_file)
@@ -68,8 +68,8 @@ def test_lookup_html_multiple_results():
     """Test HTML lookup with multiple results"""
     mock_mdx_file = Path("test.mdx")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
-    mock_builder.mdx_lookup.return_value = [
+    mock_builder.mdx_lookup_normalized.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = [
         "<html>result 1</html>",
         "<html>result 2</html>",
         "<html>result 3</html>",
@@ -86,8 +86,8 @@ def test_lookup_html_exception():
     """Test HTML lookup when exception occurs"""
     mock_mdx_file = Path("test.mdx")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
-    mock_builder.mdx_lookup.side_effect = Exception("Lookup failed")
+    mock_builder.mdx_lookup_normalized.return_value = []
+    mock_builder.mdx_lookup_normalized.side_effect = Exception("Lookup failed")
 
     with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
         dictionary = Dictionary(mock_mdx_file)
@@ -101,8 +101,8 @@ def test_lookup_html_case_insensitive():
     """Test HTML lookup with case insensitive search"""
     mock_mdx_file = Path("test.mdx")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
-    mock_builder.mdx_lookup.return_value = ["<html>result</html>"]
+    mock_builder.mdx_lookup_normalized.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = ["<html>result</html>"]
 
     with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
         dictionary = Dictionary(mock_mdx_file)
@@ -113,8 +113,8 @@ def test_lookup_html_case_insensitive():
         dictionary.lookup_html("test_word")
 
         # All should call lookup with the same word
-        assert mock_builder.mdx_lookup.call_count == 3
-        for call in mock_builder.mdx_lookup.call_args_list:
+        assert mock_builder.mdx_lookup_normalized.call_count == 3
+        for call in mock_builder.mdx_lookup_normalized.call_args_list:
             assert call[0][0] in ["Test_Word", "TEST_WORD", "test_word"]
 
 
@@ -122,22 +122,22 @@ def test_lookup_html_with_special_characters():
     """Test HTML lookup with special characters"""
     mock_mdx_file = Path("test.mdx")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
-    mock_builder.mdx_lookup.return_value = ["<html>result</html>"]
+    mock_builder.mdx_lookup_normalized.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = ["<html>result</html>"]
 
     with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
         dictionary = Dictionary(mock_mdx_file)
         result = dictionary.lookup_html("word-with-special_chars")
 
         assert result == "<html>result</html>"
-        mock_builder.mdx_lookup.assert_called_once_with("word-with-special_chars")
+        mock_builder.mdx_lookup_normalized.assert_called_once_with("word-with-special_chars")
 
 
 def test_lookup_html_empty_word():
     """Test HTML lookup with empty word"""
     mock_mdx_file = Path("test.mdx")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = []
 
     with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
         dictionary = Dictionary(mock_mdx_file)
@@ -145,14 +145,15 @@ def test_lookup_html_empty_word():
 
         # Should return empty string for empty word
         assert result == ""
-        assert mock_builder.mdx_lookup.call_count == 3  # Called 3 times due to fallback logic
+        # The whole fallback chain is a single normalized lookup
+        assert mock_builder.mdx_lookup_normalized.call_count == 1
 
 
 def test_lookup_html_whitespace_word():
     """Test HTML lookup with whitespace-only word"""
     mock_mdx_file = Path("test.mdx")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = []
 
     with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
         dictionary = Dictionary(mock_mdx_file)
@@ -160,22 +161,23 @@ def test_lookup_html_whitespace_word():
 
         # Should return empty string for whitespace-only word
         assert result == ""
-        assert mock_builder.mdx_lookup.call_count == 3  # Called 3 times due to fallback logic
+        # The whole fallback chain is a single normalized lookup
+        assert mock_builder.mdx_lookup_normalized.call_count == 1
 
 
 def test_lookup_html_unicode_word():
     """Test HTML lookup with unicode word"""
     mock_mdx_file = Path("test.mdx")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
-    mock_builder.mdx_lookup.return_value = ["<html>中文结果</html>"]
+    mock_builder.mdx_lookup_normalized.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = ["<html>中文结果</html>"]
 
     with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
         dictionary = Dictionary(mock_mdx_file)
         result = dictionary.lookup_html("中文单词")
 
         assert result == "<html>中文结果</html>"
-        mock_builder.mdx_lookup.assert_called_once_with("中文单词")
+        mock_builder.mdx_lookup_normalized.assert_called_once_with("中文单词")
 
 
 def test_dictionary_with_mdd_file():
@@ -183,8 +185,8 @@ def test_dictionary_with_mdd_file():
     mock_mdx_file = Path("test.mdx")
     mock_mdd_file = Path("test.mdd")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
-    mock_builder.mdx_lookup.return_value = ["<html>result with images</html>"]
+    mock_builder.mdx_lookup_normalized.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = ["<html>result with images</html>"]
 
     with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
         dictionary = Dictionary(mock_mdx_file)
@@ -221,8 +223,8 @@ def test_lookup_html_with_progress_callback():
     """Test HTML lookup with progress callback"""
     mock_mdx_file = Path("test.mdx")
     mock_builder = Mock()
-    mock_builder.mdx_lookup.return_value = []
-    mock_builder.mdx_lookup.return_value = ["<html>result</html>"]
+    mock_builder.mdx_lookup_normalized.return_value = []
+    mock_builder.mdx_lookup_normalized.return_value = ["<html>result</html>"]
     progress_callback = Mock()
 
     with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
@@ -248,3 +250,14 @@ def test_dictionary_multiple_instances():
         assert dict1.mdx_path == mock_mdx_file1
         assert dict2.mdx_path == mock_mdx_file2
         assert dict1 is not dict2
+
+
+def test_dictionary_exit_closes_index_connections():
+    """Leaving the context closes the IndexBuilder connections"""
+    mock_builder = Mock()
+
+    with patch("mdxscraper.core.dictionary.IndexBuilder", return_value=mock_builder):
+        with Dictionary(Path("test.mdx")):
+            mock_builder.close.assert_not_called()
+
+        mock_builder.close.assert_called_once_with()
@@ -21,6 +21,16 @@ class DummyIndex:
             return []
         return db.get(word, [])
 
+    def mdx_lookup_normalized(self, word: str):
+        return (
+            self.mdx_lookup(word)
+            or self.mdx_lookup(word, ignorecase=True)
+            or self.mdx_lookup(word.replace("-", ""), ignorecase=True)
+        )
+
+    def close(self):
+        pass
+
 
 def test_dictionary_context_and_impl_and_lookup(monkeypatch, tmp_path):
     monkeypatch.setattr("mdxscraper.core.dictionary.IndexBuilder", DummyIndex)
@@ -34,3 +44,22 @@ def test_dictionary_context_and_impl_and_lookup(monkeypatch, tmp_path):
         assert d.lookup_html("LINK") == "<div>hello</div>"
         # fallback behavior for missing
         assert d.lookup_html("missing") == ""
+
+
+class DummyBatchIndex(DummyIndex):
+    def __init__(self, _):
+        self.batches = []
+
+    def mdx_lookup_normalized_many(self, words):
+        self.batches.append(list(words))
+        return [self.mdx_lookup_normalized(word) for word in words]
+
+
+def test_lookup_html_many_matches_single_lookups(monkeypatch, tmp_path):
+    monkeypatch.setattr("mdxscraper.core.dictionary.IndexBuilder", DummyBatchIndex)
+    d = Dictionary(tmp_path / "dummy.mdx")
+    words = [" hello ", "LINK", "missing", "HELLO", "he-llo"]
+
+    assert d.lookup_html_many(words) == [d.lookup_html(w) for w in words]
+    # one batch for all words, then one for the linked words
+    assert d.impl.batches == [["hello", "LINK", "missing", "HELLO", "he-llo"], ["hello"]]
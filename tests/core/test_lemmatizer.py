@@ -0,0 +1,86 @@
+"""Tests for the rule-based lemmatizer and the lemma fallback of Dictionary"""
+
+from __future__ import annotations
+
+import pytest
+from fixtures.mdict_writer import sample_entries, write_mdx
+
+from mdxscraper.core.dictionary import Dictionary
+from mdxscraper.core.lemmatizer import lemma_candidates
+
+
+@pytest.mark.parametrize(
+    "word, lemma",
+    [
+        ("studies", "study"),
+        ("wolves", "wolf"),
+        ("knives", "knife"),
+        ("indices", "index"),
+        ("classes", "class"),
+        ("analyses", "analysis"),
+        ("boxes", "box"),
+        ("churches", "church"),
+        ("potatoes", "potato"),
+        ("houses", "house"),
+        ("cats", "cat"),
+        ("larvae", "larva"),
+        ("cacti", "cactus"),
+        ("bacteria", "bacterium"),
+        ("running", "run"),
+        ("walking", "walk"),
+        ("making", "make"),
+        ("lying", "lie"),
+        ("studied", "study"),
+        ("stopped", "stop"),
+        ("liked", "like"),
+        ("happiest", "happy"),
+        ("bigger", "big"),
+        ("nicest", "nice"),
+        ("basically", "basic"),
+        ("quickly", "quick"),
+        ("geese", "goose"),
+        ("went", "go"),
+        ("Children", "child"),
+        ("dog's", "dog"),
+    ],
+)
+def test_candidates_include_the_lemma(word, lemma):
+    assert lemma in lemma_candidates(word)
+
+
+def test_candidates_are_ordered_and_distinct():
+    assert lemma_candidates("geese")[0] == "goose"
+    assert lemma_candidates("classes")[0] == "class"
+    candidates = lemma_candidates("running")
+    assert len(candidates) == len(set(candidates))
+    assert "running" not in candidates
+
+
+def test_short_words_have_no_candidates():
+    assert lemma_candidates("a") == []
+    assert lemma_candidates("is") == ["be"]
+
+
+@pytest.fixture
+def mdx_path(tmp_path):
+    entries = sample_entries(50) + [
+        ("Goose", "<p>goose</p>"),
+        ("run", "<p>run</p>"),
+        ("runner", "@@@LINK=run"),
+        ("study", "<p>study</p>"),
+    ]
+    return write_mdx(tmp_path / "sample.mdx", sorted(entries), records_per_block=8)
+
+
+def test_lookup_lemma_many(mdx_path):
+    words = ["geese", "running", "runners", "studies", "xyzzy"]
+    expected = [
+        ("goose", "<p>goose</p>"),
+        ("run", "<p>run</p>"),
+        ("runner", "<p>run</p>"),
+        ("study", "<p>study</p>"),
+        ("", ""),
+    ]
+    for backend in ("sqlite", "sparse"):
+        with Dictionary(mdx_path, backend=backend) as dictionary:
+            assert dictionary.lookup_lemma_many(words) == expected
@@ -34,6 +34,23 @@ word3
         assert result[0]["words"] == ["word1", "word2", "word3"]
 
 
+def test_parse_txt_file_suggestions():
+    """Test that suggestions, as in invalid words files, are not part of the word"""
+    content = """# Lesson 1
+colr  # did you mean: color, colour
+C#
+ice cream # dessert
+"""
+
+    with patch.object(
+        WordParser, "_open_encoding_file", return_value=mock_open(read_data=content)()
+    ):
+        result = WordParser("test.txt").parse()
+
+        # other text after a "#" stays part of the word
+        assert result[0]["words"] == ["colr", "C#", "ice cream # dessert"]
+
+
 def test_parse_txt_file_multiple_lessons():
     """Test parsing text file with multiple lessons"""
     content = """# Lesson 1
@@ -0,0 +1,94 @@
+"""Minimal greedy LZO1X compressor used to build LZO test data.
+
+The output is a raw LZO1X stream (no header) as stored in MDict blocks of
+type 1. Compression ratio is irrelevant here; the encoder only aims to
+exercise every instruction the decompressor has to handle: short and long
+literal runs, literals carried in a match's state bits, M2/M3/M4 matches,
+extended lengths and overlapping copies.
+"""
+
+from __future__ import annotations
+
+M2_MAX_LEN = 8
+M2_MAX_OFFSET = 0x0800
+M3_MAX_OFFSET = 0x4000
+M4_MAX_OFFSET = 0xBFFF
+
+
+def _length(out: bytearray, n: int) -> None:
+    """Extended length: zero bytes worth 255 each, then the remainder."""
+    while n > 255:
+        out.append(0)
+        n -= 255
+    out.append(n)
+
+
+def _literals(out: bytearray, literals: bytes, state_index: int | None) -> None:
+    size = len(literals)
+    if not size:
+        return
+    if not out and size <= 238:
+        out.append(17 + size)
+    elif state_index is not None and size <= 3:
+        out[state_index] |= size
+    elif size <= 18:
+        out.append(size - 3)
+    else:
+        out.append(0)
+        _length(out, size - 18)
+    out += literals
+
+
+def _match(out: bytearray, distance: int, length: int) -> int:
+    """Append a match; returns the index of the byte carrying its state bits."""
+    if length <= M2_MAX_LEN and distance <= M2_MAX_OFFSET:
+        distance -= 1
+        out.append((length - 1) << 5 | (distance & 7) << 2)
+        out.append(distance >> 3)
+        return len(out) - 2
+    if distance <= M3_MAX_OFFSET:
+        distance -= 1
+        if length - 2 <= 31:
+            out.append(32 | (length - 2))
+        else:
+            out.append(32)
+            _length(out, length - 2 - 31)
+    else:
+        distance -= 0x4000
+        marker = 16 | (distance & 0x4000) >> 11
+        if length - 2 <= 7:
+            out.append(marker | (length - 2))
+        else:
+            out.append(marker)
+            _length(out, length - 2 - 7)
+        distance &= 0x3FFF
+    out.append((distance << 2) & 0xFF)
+    out.append(distance >> 6)
+    return len(out) - 2
+
+
+def compress(data: bytes) -> bytes:
+    """Compress ``data`` into a raw LZO1X stream."""
+    out = bytearray()
+    size = len(data)
+    last_seen: dict[bytes, int] = {}
+    state_index = None
+    literal_start = pos = 0
+    while pos + 3 <= size:
+        prefix = data[pos : pos + 3]
+        candidate = last_seen.get(prefix)
+        last_seen[prefix] = pos
+        if candidate is None or pos - candidate > M4_MAX_OFFSET:
+            pos += 1
+            continue
+        length = 3
+        while pos + length < size and data[candidate + length] == data[pos + length]:
+            length += 1
+        _literals(out, data[literal_start:pos], state_index)
+        state_index = _match(out, pos - candidate, length)
+        pos += length
+        literal_start = pos
+    _literals(out, data[literal_start:], state_index)
+    # end of stream: an M4 match with distance 0x4000
+    out += b"\x11\x00\x00"
+    return bytes(out)
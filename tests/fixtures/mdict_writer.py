@@ -0,0 +1,193 @@
+"""Minimal MDict (.mdx/.mdd) writer used to build synthetic dictionaries in tests.
+
+Only the subset of the format read by the vendored ``readmdict`` is produced:
+engine version 2.0, zlib, LZO (``compress="lzo"``) or stored key and record
+blocks.
+"""
+
+from __future__ import annotations
+
+import zlib
+from pathlib import Path
+from struct import pack
+from typing import Iterable, Sequence, Tuple
+
+from fixtures import lzo1x
+
+
+def _block(data: bytes, compress: bool | str = True) -> bytes:
+    checksum = pack(">I", zlib.adler32(data) & 0xFFFFFFFF)
+    if compress == "lzo":
+        return b"\x01\x00\x00\x00" + checksum + lzo1x.compress(data)
+    if compress:
+        return b"\x02\x00\x00\x00" + checksum + zlib.compress(data)
+    return b"\x00\x00\x00\x00" + checksum + data
+
+
+def _encrypt_key_info(block: bytes) -> bytes:
+    """Inverse of readmdict._mdx_decrypt, for files with Encrypted="2"."""
+    # ripemd128 is vendored with readmdict; importable once mdxscraper.mdict is imported
+    from ripemd128 import ripemd128
+
+    import mdxscraper.mdict  # noqa: F401
+
+    key = ripemd128(block[4:8] + pack("<L", 0x3695))
+    out = bytearray(block)
+    previous = 0x36
+    for i in range(8, len(block)):
+        t = block[i] ^ previous ^ ((i - 8) & 0xFF) ^ key[(i - 8) % len(key)]
+        out[i] = (t >> 4 | t << 4) & 0xFF
+        previous = out[i]
+    return bytes(out)
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _write(
+    path: Path,
+    header_tag: str,
+    entries: Sequence[Tuple[str, bytes]],
+    encoding: str,
+    keys_per_block: int,
+    records_per_block: int,
+    compress: bool | str,
+    title: str,
+    encrypt_key_info: bool = False,
+) -> Path:
+    path = Path(path)
+    is_utf16 = encoding.upper() == "UTF-16"
+    key_codec = "utf-16-le" if is_utf16 else encoding
+    terminator = b"\x00\x00" if is_utf16 else b"\x00"
+
+    header = (
+        f'<{header_tag} GeneratedByEngineVersion="2.0" RequiredEngineVersion="2.0" '
+        f'Encrypted="{2 if encrypt_key_info else 0}" Encoding="{"" if is_utf16 else encoding}" Format="Html" '
+        f'Title="{title}" Description="synthetic test dictionary"/>\r\n\x00'
+    ).encode("utf-16-le")
+
+    # Record offsets are positions in the concatenated decompressed record data
+    offsets = []
+    position = 0
+    for _, record in entries:
+        offsets.append(position)
+        position += len(record)
+
+    key_blocks = []
+    key_info = b""
+    indexed = list(zip(offsets, (key for key, _ in entries)))
+    for chunk in _chunks(indexed, keys_per_block):
+        raw = b"".join(pack(">Q", off) + key.encode(key_codec) + terminator for off, key in chunk)
+        block = _block(raw, compress)
+        key_blocks.append(block)
+        key_info += pack(">Q", len(chunk))
+        for text in (chunk[0][1].encode(key_codec), chunk[-1][1].encode(key_codec)):
+            # sizes are in bytes, or in code units for UTF-16
+            key_info += pack(">H", len(text) // len(terminator)) + text + terminator
+        key_info += pack(">QQ", len(block), len(raw))
+    key_info_block = _block(key_info)
+    if encrypt_key_info:
+        key_info_block = _encrypt_key_info(key_info_block)
+    key_block_data = b"".join(key_blocks)
+
+    key_section = pack(
+        ">QQQQQ",
+        len(key_blocks),
+        len(entries),
+        len(key_info),
+        len(key_info_block),
+        len(key_block_data),
+    )
+
+    record_blocks = []
+    record_info = b""
+    for chunk in _chunks([record for _, record in entries], records_per_block):
+        raw = b"".join(chunk)
+        block = _block(raw, compress)
+        record_blocks.append(block)
+        record_info += pack(">QQ", len(block), len(raw))
+    record_data = b"".join(record_blocks)
+
+    with open(path, "wb") as f:
+        f.write(pack(">I", len(header)))
+        f.write(header)
+        f.write(pack("<I", zlib.adler32(header) & 0xFFFFFFFF))
+        f.write(key_section)
+        f.write(pack(">I", zlib.adler32(key_section) & 0xFFFFFFFF))
+        f.write(key_info_block)
+        f.write(key_block_data)
+        f.write(pack(">QQQQ", len(record_blocks), len(entries), len(record_info), len(record_data)))
+        f.write(record_info)
+        f.write(record_data)
+    return path
+
+
+def write_mdx(
+    path: Path | str,
+    entries: Sequence[Tuple[str, str]],
+    encoding: str = "UTF-8",
+    keys_per_block: int = 64,
+    records_per_block: int = 16,
+    compress: bool | str = True,
+    title: str = "Test Dictionary",
+    encrypt_key_info: bool = False,
+) -> Path:
+    """Write ``entries`` (headword, html) to an .mdx file and return its path.
+
+    ``encrypt_key_info`` enciphers the key block info section (Encrypted="2").
+    """
+    records = [(key, html.encode(encoding) + b"\x00") for key, html in entries]
+    return _write(
+        Path(path),
+        "Dictionary",
+        records,
+        encoding,
+        keys_per_block,
+        records_per_block,
+        compress,
+        title,
+        encrypt_key_info,
+    )
+
+
+def write_mdd(
+    path: Path | str,
+    resources: Sequence[Tuple[str, bytes]],
+    keys_per_block: int = 64,
+    records_per_block: int = 16,
+    compress: bool | str = True,
+) -> Path:
+    """Write ``resources`` (\\path\\name, data) to an .mdd file and return its path."""
+    return _write(
+        Path(path),
+        "Library_Data",
+        list(resources),
+        "UTF-16",
+        keys_per_block,
+        records_per_block,
+        compress,
+        "",
+    )
+
+
+def mixed_case_entries(count: int) -> list[Tuple[str, str]]:
+    """``sample_entries`` plus keys differing in case and punctuation, sorted
+    case-insensitively as MDict writers do."""
+    entries = sample_entries(count) + [
+        ("Apple", "<p>Apple</p>"),
+        ("apple", "<p>apple</p>"),
+        ("ice-cream", "<p>ice-cream</p>"),
+        ("café", "<p>café</p>"),
+    ]
+    entries.sort(key=lambda e: e[0].lower())
+    return entries
+
+
+def sample_entries(count: int, prefix: str = "word") -> list[Tuple[str, str]]:
+    """Return ``count`` sorted synthetic entries with distinct definitions."""
+    return [
+        (f"{prefix}{i:06d}", f"<div class='def'>definition of {prefix}{i:06d}</div>")
+        for i in range(count)
+    ]
@@ -0,0 +1,43 @@
+"""Shared fixtures of the mdict tests: a synthetic dictionary written to tmp_path
+
+mdx_path writes sample.mdx, and sample.mdd, sample.1.mdd... beside it, from the
+fixtures it depends on. A module needing other contents overrides those.
+"""
+
+from __future__ import annotations
+
+import pytest
+from fixtures.mdict_writer import sample_entries, write_mdd, write_mdx
+
+
+@pytest.fixture
+def mdx_entries():
+    """(headword, html) entries of sample.mdx, in file order."""
+    return sample_entries(100)
+
+
+@pytest.fixture
+def mdx_options():
+    """write_mdx keyword arguments of sample.mdx."""
+    return {"records_per_block": 20}
+
+
+@pytest.fixture
+def mdd_volumes():
+    """[(resource key, data)] of each .mdd volume; none by default."""
+    return []
+
+
+@pytest.fixture
+def mdd_options():
+    """write_mdd keyword arguments of every .mdd volume."""
+    return {}
+
+
+@pytest.fixture
+def mdx_path(tmp_path, mdx_entries, mdx_options, mdd_volumes, mdd_options):
+    path = write_mdx(tmp_path / "sample.mdx", mdx_entries, **mdx_options)
+    for volume, resources in enumerate(mdd_volumes):
+        name = f"sample.{volume}.mdd" if volume else "sample.mdd"
+        write_mdd(tmp_path / name, resources, **mdd_options)
+    return path
@@ -0,0 +1,105 @@
+"""Tests for IndexBuilder(backend="binary"): lookups in the memory-mapped index"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from fixtures.mdict_writer import mixed_case_entries
+
+from mdxscraper.core.dictionary import Dictionary
+from mdxscraper.mdict import IndexBuilder
+
+from mdict_binary import BinaryIndex  # isort: skip
+
+
+@pytest.fixture
+def mdx_entries():
+    return mixed_case_entries(300)
+
+
+@pytest.fixture
+def mdx_options():
+    return {"keys_per_block": 16, "records_per_block": 20}
+
+
+@pytest.fixture
+def mdd_volumes():
+    return [[("\\img\\a.png", b"\x89PNG-a")], [("\\img\\b.png", b"\x89PNG-b")]]
+
+
+WORDS = ["word000000", "word000015", "word000016", "word000299", "Apple", "apple", "missing"]
+NORMALIZED = WORDS + ["APPLE", "Ice Cream", "icecream", "CAFÉ", "cafe"]
+
+
+def test_binary_lookups_match_the_sqlite_index(mdx_path):
+    path = str(mdx_path)
+    with IndexBuilder(path, backend="binary") as binary:
+        assert (mdx_path.with_suffix(".mdx.idx")).exists()
+        assert (mdx_path.with_suffix(".mdd.idx")).exists()
+        with IndexBuilder(path) as indexed:
+            for word in WORDS:
+                assert binary.mdx_lookup(word) == indexed.mdx_lookup(word)
+                assert binary.mdx_lookup(word, True) == indexed.mdx_lookup(word, True)
+            for word in NORMALIZED:
+                assert binary.mdx_lookup_normalized(word) == indexed.mdx_lookup_normalized(word)
+            assert binary.mdx_lookup_many(WORDS) == indexed.mdx_lookup_many(WORDS)
+            assert binary.mdx_lookup_normalized_many(NORMALIZED) == (
+                indexed.mdx_lookup_normalized_many(NORMALIZED)
+            )
+            assert binary.get_mdx_keys("WORD00029*") == indexed.get_mdx_keys("WORD00029*")
+
+
+def test_binary_mdd_lookup_covers_every_volume(mdx_path):
+    with IndexBuilder(str(mdx_path), backend="binary") as binary:
+        assert binary.mdd_lookup("\\img\\a.png") == [b"\x89PNG-a"]
+        assert binary.mdd_lookup("\\img\\b.png") == [b"\x89PNG-b"]
+        assert binary.mdd_lookup("\\IMG\\B.PNG", ignorecase=True) == [b"\x89PNG-b"]
+        assert binary.mdd_lookup("\\img\\c.png") == []
+
+
+def test_lookups_reopen_the_index_after_close(mdx_path):
+    binary = IndexBuilder(str(mdx_path), backend="binary")
+    assert binary.mdx_lookup("apple") == ["<p>apple</p>"]
+    binary.close()
+    assert binary.mdx_lookup("apple") == ["<p>apple</p>"]
+    binary.close()
+
+
+def test_up_to_date_index_is_reused(mdx_path):
+    path = str(mdx_path)
+    IndexBuilder(path, backend="binary").close()
+    idx = mdx_path.with_suffix(".mdx.idx")
+    mtime = idx.stat().st_mtime_ns
+    with IndexBuilder(path, backend="binary") as binary:
+        assert binary.mdx_lookup("Apple") == ["<p>Apple</p>"]
+    assert idx.stat().st_mtime_ns == mtime
+
+
+def test_stale_index_is_rebuilt(mdx_path):
+    path = str(mdx_path)
+    IndexBuilder(path, backend="binary").close()
+    idx = mdx_path.with_suffix(".mdx.idx")
+    db_mtime = (mdx_path.with_suffix(".mdx.db")).stat().st_mtime
+    os.utime(idx, (db_mtime - 60, db_mtime - 60))
+    with IndexBuilder(path, backend="binary") as binary:
+        assert binary.mdx_lookup("Apple") == ["<p>Apple</p>"]
+    assert idx.stat().st_mtime >= db_mtime
+
+
+def test_corrupt_index_is_rebuilt(mdx_path):
+    path = str(mdx_path)
+    IndexBuilder(path, backend="binary").close()
+    idx = mdx_path.with_suffix(".mdx.idx")
+    idx.write_bytes(b"garbage" * 10)
+    with pytest.raises(ValueError):
+        BinaryIndex(str(idx), {None: "key_text"}).close()
+    with IndexBuilder(path, backend="binary") as binary:
+        assert binary.mdx_lookup("word000150") == [
+            "<div class='def'>definition of word000150</div>"
+        ]
+
+
+def test_dictionary_accepts_the_binary_backend(mdx_path):
+    with Dictionary(mdx_path, backend="binary") as dictionary:
+        assert dictionary.lookup_html("APPLE") == "<p>Apple</p>"
@@ -0,0 +1,128 @@
+"""Tests for the decompressed record block cache"""
+
+from __future__ import annotations
+
+import zlib
+
+import pytest
+from fixtures.mdict_writer import sample_entries, write_mdd, write_mdx
+
+from mdxscraper.mdict import IndexBuilder
+from mdxscraper.mdict.mdict_query import BlockCache
+
+from mdict_cache import PartialBlock  # isort: skip
+
+
+def test_cache_is_bounded_by_bytes():
+    cache = BlockCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"5678")
+    assert cache.get("a") == b"1234"  # "a" becomes most recently used
+    cache.put("c", b"90ab")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"90ab"
+    assert cache.stats() == {
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+        "blocks": 2,
+        "bytes": 8,
+        "max_bytes": 10,
+    }
+
+
+def test_cache_skips_blocks_larger_than_limit():
+    cache = BlockCache(max_bytes=4)
+    cache.put("big", b"12345")
+    assert len(cache) == 0
+    cache.put("a", b"12")
+    cache.put("a", b"123")
+    assert cache.stats()["bytes"] == 3
+
+
+def test_partial_block_inflates_on_demand_and_resumes():
+    data = b"".join(b"record %05d;" % i for i in range(5000))
+    block = PartialBlock(zlib.compress(data), len(data))
+    assert block.inflate(10) == data[:10]
+    assert len(block) < len(data)
+    assert block.inflate(4000)[:4000] == data[:4000]
+    assert not block.complete
+    assert block.inflate(100) == data[:4000]  # never shrinks
+    assert block.inflate() == data
+    assert block.complete
+
+
+def test_partial_block_rejects_truncated_data():
+    data = bytes(range(256)) * 64
+    block = PartialBlock(zlib.compress(data)[:100], len(data))
+    with pytest.raises(zlib.error):
+        block.inflate()
+
+
+def test_cache_recounts_a_block_that_grew():
+    cache = BlockCache(max_bytes=10)
+    block = bytearray(b"12")
+    cache.put("a", block)
+    block += b"3456"
+    cache.put("a", block)
+    assert cache.stats()["bytes"] == 6
+    cache.put("b", b"78901")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 5
+
+
+@pytest.fixture
+def builder(tmp_path):
+    path = write_mdx(tmp_path / "cache.mdx", sample_entries(100), records_per_block=10)
+    write_mdd(tmp_path / "cache.mdd", [(f"\\{i}.png", bytes([i]) * 8) for i in range(20)])
+    with IndexBuilder(str(path)) as b:
+        yield b
+
+
+def test_adjacent_words_share_a_decompressed_block(builder):
+    for i in range(10):
+        builder.mdx_lookup(f"word{i:06d}")
+    stats = builder.block_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 9
+
+
+def test_mdx_and_mdd_lookups_share_the_cache(builder):
+    builder.mdx_lookup("word000000")
+    builder.mdd_lookup("\\0.png")
+    builder.mdd_lookup("\\1.png")
+    stats = builder.block_cache_stats()
+    assert stats["blocks"] == 2
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_cache_can_be_disabled(tmp_path):
+    path = write_mdx(tmp_path / "nocache.mdx", sample_entries(5))
+    with IndexBuilder(str(path), block_cache_size=0) as b:
+        assert b.mdx_lookup("word000004") == ["<div class='def'>definition of word000004</div>"]
+        assert b.block_cache_stats() == {}
+
+
+def test_lookup_inflates_a_block_only_up_to_the_record(tmp_path):
+    path = write_mdx(tmp_path / "big.mdx", sample_entries(500), records_per_block=500)
+    with IndexBuilder(str(path)) as b:
+        assert b.mdx_lookup("word000001") == ["<div class='def'>definition of word000001</div>"]
+        first = b.block_cache_stats()["bytes"]
+        assert b.mdx_lookup("word000499") == ["<div class='def'>definition of word000499</div>"]
+        full = b.block_cache_stats()["bytes"]
+        assert first < full / 10
+        # complete now: further lookups are served from the decompressed block
+        assert b.mdx_lookup_many(["word000250", "word000002"]) == [
+            ["<div class='def'>definition of word000250</div>"],
+            ["<div class='def'>definition of word000002</div>"],
+        ]
+        assert b.block_cache_stats()["bytes"] == full
+
+
+@pytest.mark.parametrize("options", [{"partial_decompress": False}, {"block_cache_size": 0}])
+def test_lookup_results_do_not_depend_on_partial_decompression(tmp_path, options):
+    path = write_mdx(tmp_path / "big.mdx", sample_entries(300), records_per_block=100)
+    with IndexBuilder(str(path), **options) as b:
+        for word in ("word000000", "word000150", "word000299"):
+            assert b.mdx_lookup(word) == [f"<div class='def'>definition of {word}</div>"]
@@ -0,0 +1,109 @@
+"""Tests for the Bloom filter that rejects words missing from the dictionary"""
+
+from __future__ import annotations
+
+import pytest
+from fixtures.mdict_writer import sample_entries
+
+from mdxscraper.mdict import IndexBuilder
+
+import mdict_query  # isort: skip
+from mdict_bloom import BloomFilter  # isort: skip
+
+
+@pytest.fixture
+def mdx_entries():
+    return sample_entries(200) + [("Café-au-lait", "<div class='def'>coffee</div>")]
+
+
+def test_filter_has_no_false_negatives_and_about_its_error_rate():
+    bloom = BloomFilter.sized(5000, 0.01)
+    words = [f"word{i}" for i in range(5000)]
+    for word in words:
+        bloom.add(word)
+    assert all(word in bloom for word in words)
+    false_positives = sum(f"missing{i}" in bloom for i in range(20000))
+    assert false_positives < 20000 * 0.02
+
+
+def test_max_bytes_caps_the_filter():
+    assert BloomFilter.sized(100000, 0.001, max_bytes=1024).stats()["bytes"] == 1024
+
+
+def test_filter_round_trips_through_a_file(tmp_path):
+    bloom = BloomFilter.sized(10, 0.01)
+    bloom.add("apple")
+    path = str(tmp_path / "x.bloom")
+    bloom.write(path)
+    loaded = BloomFilter.load(path)
+    assert "apple" in loaded
+    assert (loaded.bits, loaded.hashes, loaded.items) == (bloom.bits, bloom.hashes, 1)
+
+
+def test_missing_words_are_rejected_before_any_query(mdx_path, monkeypatch):
+    with IndexBuilder(str(mdx_path), bloom_error_rate=0.001) as builder:
+        assert (mdx_path.parent / "sample.mdx.bloom").exists()
+        # every tier still matches
+        assert builder.mdx_lookup_normalized("WORD000042") == [
+            "<div class='def'>definition of word000042</div>"
+        ]
+        assert builder.mdx_lookup_normalized("cafe au lait") == ["<div class='def'>coffee</div>"]
+        assert builder.mdx_lookup("word000007") == [
+            "<div class='def'>definition of word000007</div>"
+        ]
+
+        def no_query(*args, **kwargs):
+            raise AssertionError("queried the index")
+
+        monkeypatch.setattr(mdict_query.IndexBuilder, "lookup_normalized_indexes", no_query)
+        monkeypatch.setattr(mdict_query.IndexBuilder, "lookup_normalized_indexes_many", no_query)
+        assert builder.mdx_lookup_normalized("nonexistent") == []
+        assert builder.mdx_lookup_normalized_many(["absent", "missing"]) == [[], []]
+        stats = builder.bloom_filter_stats()
+    assert stats["probes"] == 6
+    assert stats["rejected"] == 3
+
+
+def test_batch_lookups_keep_their_order(mdx_path):
+    with IndexBuilder(str(mdx_path), bloom_error_rate=0.01) as builder:
+        words = ["word000003", "missing", "Word000001", "word000003"]
+        assert builder.mdx_lookup_normalized_many(words) == [
+            ["<div class='def'>definition of word000003</div>"],
+            [],
+            ["<div class='def'>definition of word000001</div>"],
+            ["<div class='def'>definition of word000003</div>"],
+        ]
+        assert builder.mdx_lookup_many(words)[1:3] == [[], []]
+
+
+def test_filter_is_reused_until_its_settings_change(mdx_path):
+    path = mdx_path.parent / "sample.mdx.bloom"
+    IndexBuilder(str(mdx_path), bloom_error_rate=0.01).close()
+    built = path.stat().st_mtime_ns
+    IndexBuilder(str(mdx_path), bloom_error_rate=0.01).close()
+    assert path.stat().st_mtime_ns == built
+    with IndexBuilder(str(mdx_path), bloom_error_rate=0.01, bloom_max_size=64) as builder:
+        assert builder.bloom_filter_stats()["bytes"] == 64
+
+
+def test_no_filter_by_default(mdx_path):
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdx_lookup_normalized("missing") == []
+        assert builder.bloom_filter_stats() == {}
+    assert not (mdx_path.parent / "sample.mdx.bloom").exists()
+
+
+def test_candidates_ruled_out_are_not_probed(mdx_path, monkeypatch):
+    with IndexBuilder(str(mdx_path), bloom_error_rate=0.001) as builder:
+        probed = []
+        lookup = mdict_query.IndexBuilder.lookup_casefolded_indexes_many
+
+        def recording(self, db, keys, resolve_links=False):
+            probed.extend(keys)
+            return lookup(self, db, keys, resolve_links)
+
+        monkeypatch.setattr(mdict_query.IndexBuilder, "lookup_casefolded_indexes_many", recording)
+        assert builder.mdx_lookup_first_many([["missing", "Word000042"]]) == [
+            ("word000042", ["<div class='def'>definition of word000042</div>"])
+        ]
+        assert probed == ["word000042"]
@@ -0,0 +1,117 @@
+"""Tests for batch lookups resolved through a temporary table join"""
+
+from __future__ import annotations
+
+import pytest
+from fixtures.mdict_writer import sample_entries, write_mdx
+
+from mdxscraper.mdict import IndexBuilder
+
+import mdict_query  # isort: skip
+
+EXTRA = [
+    ('say "hi"', "<div class='def'>a greeting</div>"),
+    ("Café-au-lait", "<div class='def'>coffee</div>"),
+    ("Apple", "<div class='def'>fruit</div>"),
+    ("US", "<div class='def'>country</div>"),
+    ("us", "<div class='def'>pronoun</div>"),
+]
+WORDS = [
+    "word000150",
+    'say "hi"',
+    "missing",
+    "cafe au lait",
+    "apple",
+    "WORD000003",
+    "word000150",
+    "us",
+    "Us",
+]
+
+
+@pytest.fixture
+def mdx_entries():
+    return sample_entries(200) + EXTRA
+
+
+@pytest.fixture(params=["fast", "default"])
+def builder(request, mdx_path):
+    with IndexBuilder(str(mdx_path), read_profile=request.param) as builder:
+        yield builder
+
+
+def _both_ways(monkeypatch, lookup):
+    """lookup() by IN (...) queries, then through the temporary table."""
+    by_in = lookup()
+    monkeypatch.setattr(mdict_query, "BULK_LOOKUP_MIN", 0)
+    return by_in, lookup()
+
+
+def test_normalized_batch_matches_in_queries(builder, monkeypatch):
+    by_in, bulk = _both_ways(monkeypatch, lambda: builder.mdx_lookup_normalized_many(WORDS))
+    assert bulk == by_in
+    assert bulk[1] == ["<div class='def'>a greeting</div>"]
+    assert bulk[3] == ["<div class='def'>coffee</div>"]
+    assert bulk[4] == ["<div class='def'>fruit</div>"]
+    assert bulk[5] == ["<div class='def'>definition of word000003</div>"]
+    # the exact key wins over case-folded ones; those all match, in file order
+    assert bulk[7] == ["<div class='def'>pronoun</div>"]
+    assert bulk[8] == ["<div class='def'>country</div>", "<div class='def'>pronoun</div>"]
+
+
+def test_exact_batch_matches_in_queries(builder, monkeypatch):
+    by_in, bulk = _both_ways(monkeypatch, lambda: builder.mdx_lookup_many(WORDS))
+    assert bulk == by_in
+    assert bulk[4] == bulk[5] == []
+    assert bulk[0] == bulk[6] == ["<div class='def'>definition of word000150</div>"]
+
+
+def test_ignorecase_batch_matches_in_queries(builder, monkeypatch):
+    by_in, bulk = _both_ways(monkeypatch, lambda: builder.mdx_lookup_many(WORDS, ignorecase=True))
+    assert bulk == by_in
+    assert bulk[4] == ["<div class='def'>fruit</div>"]
+    assert bulk[5] == ["<div class='def'>definition of word000003</div>"]
+
+
+def test_connection_is_left_as_it_was(builder, monkeypatch):
+    monkeypatch.setattr(mdict_query, "BULK_LOOKUP_MIN", 0)
+    conn = builder._connection(builder._mdx_db)
+    query_only = conn.execute("PRAGMA query_only").fetchone()[0]
+    for _ in range(2):
+        builder.mdx_lookup_normalized_many(WORDS)
+    assert conn.execute("PRAGMA query_only").fetchone()[0] == query_only
+    assert not conn.in_transaction
+    assert conn.execute("SELECT name FROM sqlite_temp_master").fetchall() == []
+
+
+def test_first_of_candidates_matches_in_queries(builder, monkeypatch):
+    candidate_lists = [["missing", "APPLE", "word000001"], ["nope"], [], ["Us", "apple"]]
+    expected = [
+        ("apple", ["<div class='def'>fruit</div>"]),
+        (None, []),
+        (None, []),
+        ("us", ["<div class='def'>country</div>", "<div class='def'>pronoun</div>"]),
+    ]
+    assert builder.mdx_lookup_first_many(candidate_lists) == expected
+    monkeypatch.setattr(mdict_query, "BULK_LOOKUP_MIN", 0)
+    assert builder.mdx_lookup_first_many(candidate_lists) == expected
+
+
+def test_redirected_rows_keep_key_order(tmp_path, monkeypatch):
+    # Grey redirects to a key in a later block than grey, its case-folded twin
+    entries = sample_entries(60) + [
+        ("Grey", "@@@LINK=zgray"),
+        ("grey", "<p>grey (UK)</p>"),
+        ("zgray", "<p>gray</p>"),
+    ]
+    mdx_path = write_mdx(tmp_path / "sample.mdx", sorted(entries), records_per_block=8)
+    words = ["GREY", "grey", "Grey", "word000007", "gray"]
+    with IndexBuilder(str(mdx_path)) as builder:
+        db = builder._mdx_db
+        by_in, bulk = _both_ways(
+            monkeypatch,
+            lambda: builder.lookup_normalized_indexes_many(db, words, resolve_links=True),
+        )
+        assert bulk == by_in
+        assert builder.mdx_lookup_normalized_many(words)[0] == ["<p>gray</p>", "<p>grey (UK)</p>"]
+        assert builder.mdx_lookup_normalized("GREY")[0] == "<p>gray</p>"
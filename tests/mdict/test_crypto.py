@@ -0,0 +1,64 @@
+"""NumPy cipher implementations must match the pure-Python ones byte for byte"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+from fixtures.mdict_writer import sample_entries, write_mdx
+
+from mdxscraper.mdict import IndexBuilder
+
+import readmdict  # isort: skip
+from pureSalsa20 import Salsa20  # isort: skip
+
+mdict_crypto = pytest.importorskip("mdict_crypto", reason="NumPy is not installed")
+
+LENGTHS = [0, 1, 7, 63, 64, 65, 255, 256, 257, 1000, 4096, 10007]
+
+
+def _random_bytes(rng, n):
+    return bytes(rng.getrandbits(8) for _ in range(n))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fast_decrypt_matches_pure_python(seed):
+    rng = random.Random(seed)
+    for length in LENGTHS:
+        data = _random_bytes(rng, length)
+        key = _random_bytes(rng, rng.choice([1, 5, 16, 20]))
+        assert mdict_crypto.fast_decrypt(data, key) == readmdict._fast_decrypt_py(data, key)
+
+
+@pytest.mark.parametrize("rounds", [8, 12, 20])
+@pytest.mark.parametrize("key_size", [16, 32])
+def test_salsa20_matches_pure_python(rounds, key_size):
+    rng = random.Random(rounds * key_size)
+    for length in LENGTHS[:-1]:
+        data = _random_bytes(rng, length)
+        key = _random_bytes(rng, key_size)
+        iv = _random_bytes(rng, 8)
+        expected = Salsa20(key=key, IV=iv, rounds=rounds).encryptBytes(data)
+        assert mdict_crypto.salsa20_xor(data, key, iv, rounds=rounds) == expected
+
+
+def test_salsa20_counter_carries_into_high_word():
+    key, iv, data = b"k" * 32, b"\x01" * 8, b"\x00" * 192
+    s20 = Salsa20(key=key, IV=iv, rounds=8)
+    s20.setCounter(2**32 - 1)
+    expected = s20.encryptBytes(data)
+    assert mdict_crypto.salsa20_xor(data, key, iv, rounds=8, counter=2**32 - 1) == expected
+
+
+def test_encrypted_key_info_is_readable(tmp_path):
+    path = write_mdx(tmp_path / "enc.mdx", sample_entries(300), encrypt_key_info=True)
+    with IndexBuilder(str(path)) as builder:
+        assert builder.mdx_lookup("word000299") == [
+            "<div class='def'>definition of word000299</div>"
+        ]
+
+
+def test_pure_python_fallback_reads_encrypted_key_info(tmp_path, monkeypatch):
+    monkeypatch.setattr(readmdict, "_numpy_fast_decrypt", None)
+    path = write_mdx(tmp_path / "enc.mdx", sample_entries(50), encrypt_key_info=True)
+    assert len(list(readmdict.MDX(str(path)).keys())) == 50
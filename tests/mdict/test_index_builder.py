@@ -0,0 +1,357 @@
+"""Tests for the vendored IndexBuilder against synthetic dictionaries"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+from fixtures.mdict_writer import sample_entries, write_mdd, write_mdx
+
+from mdxscraper.mdict import IndexBuilder
+
+
+@pytest.fixture
+def mdx_entries():
+    entries = sample_entries(200) + [("Zebra", "<b>zebra</b>"), ('quo"te', "<i>quote</i>")]
+    entries.sort(key=lambda e: e[0])
+    return entries
+
+
+@pytest.fixture
+def mdx_options():
+    return {"keys_per_block": 32, "records_per_block": 20}
+
+
+@pytest.fixture
+def mdd_volumes():
+    return [
+        [("\\img\\a.png", b"\x89PNG-a"), ("\\style.css", b"b{}")],
+        [("\\img\\b.png", b"\x89PNG-b")],
+    ]
+
+
+def test_builds_index_and_looks_up(mdx_path):
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdx_lookup("word000042") == [
+            "<div class='def'>definition of word000042</div>"
+        ]
+        assert builder.mdx_lookup("zebra") == []
+        assert builder.mdx_lookup("zebra", ignorecase=True) == ["<b>zebra</b>"]
+        assert builder.mdd_lookup("\\img\\a.png") == [b"\x89PNG-a"]
+        assert builder.mdd_lookup("\\img\\b.png") == [b"\x89PNG-b"]
+        assert builder.get_mdx_keys("word00019*") == [f"word00019{i}" for i in range(10)]
+
+
+def test_checked_build_reports_progress(mdx_path):
+    calls = []
+    builder = IndexBuilder(
+        str(mdx_path),
+        check=True,
+        workers=2,
+        progress_callback=lambda *args: calls.append(args),
+    )
+    assert builder.mdx_lookup("word000042") == ["<div class='def'>definition of word000042</div>"]
+    assert builder.mdd_lookup("\\img\\b.png") == [b"\x89PNG-b"]
+    builder.close()
+
+    finished = [(Path(name).name, done) for name, done, total in calls if done == total]
+    assert finished == [("sample.mdx", 11), ("sample.mdd", 1), ("sample.1.mdd", 1)]
+
+
+def test_builds_serially_by_default(mdx_path, monkeypatch):
+    import mdict_query  # isort: skip
+    import readmdict  # isort: skip
+
+    def no_pool(workers):
+        raise AssertionError("no process pool expected, asked for {}".format(workers))
+
+    monkeypatch.setattr(mdict_query.os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(mdict_query, "ProcessPoolExecutor", no_pool)
+    monkeypatch.setattr(readmdict, "ProcessPoolExecutor", no_pool)
+    with IndexBuilder(str(mdx_path), check=True) as builder:
+        assert builder.mdx_lookup("word000042") == [
+            "<div class='def'>definition of word000042</div>"
+        ]
+        assert builder.mdd_lookup("\\img\\b.png") == [b"\x89PNG-b"]
+
+
+def test_lookup_binds_parameters(mdx_path):
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdx_lookup('quo"te') == ["<i>quote</i>"]
+        assert builder.mdx_lookup('" OR 1=1 --') == []
+
+
+def test_connection_is_reused_per_thread(mdx_path):
+    builder = IndexBuilder(str(mdx_path))
+    first = builder._connection(builder._mdx_db)
+    builder.mdx_lookup("word000001")
+    assert builder._connection(builder._mdx_db) is first
+
+    other = []
+    worker = threading.Thread(target=lambda: other.append(builder._connection(builder._mdx_db)))
+    worker.start()
+    worker.join()
+    assert other[0] is not first
+    builder.close()
+
+
+def test_close_allows_reopen(mdx_path):
+    builder = IndexBuilder(str(mdx_path))
+    builder.mdx_lookup("word000001")
+    builder.close()
+    assert builder.mdx_lookup("word000002") == ["<div class='def'>definition of word000002</div>"]
+    builder.close()
+
+
+def test_lookups_from_several_threads(mdx_path):
+    builder = IndexBuilder(str(mdx_path))
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(offset, 200, 4):
+                word = f"word{i:06d}"
+                assert builder.mdx_lookup(word) == [f"<div class='def'>definition of {word}</div>"]
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    builder.close()
+    assert errors == []
+
+
+def test_dictionary_files_are_mapped_once(mdx_path):
+    builder = IndexBuilder(str(mdx_path))
+    builder.mdx_lookup("word000001")
+    reader = builder._reader(str(mdx_path))
+    builder.mdx_lookup("word000150")
+    assert builder._reader(str(mdx_path)) is reader
+    assert reader._map is not None
+
+    builder.mdd_lookup("\\img\\a.png")
+    builder.mdd_lookup("\\img\\b.png")
+    assert len(builder._readers) == 3  # .mdx, .mdd and .1.mdd
+    builder.close()
+    assert builder._readers == {}
+
+
+def test_reader_falls_back_to_plain_reads(mdx_path, monkeypatch):
+    import mmap
+
+    def no_mmap(*args, **kwargs):
+        raise OSError("mmap not supported")
+
+    monkeypatch.setattr(mmap, "mmap", no_mmap)
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdx_lookup("word000077") == [
+            "<div class='def'>definition of word000077</div>"
+        ]
+        assert builder.mdd_lookup("\\style.css") == [b"b{}"]
+        assert builder._reader(str(mdx_path))._map is None
+
+
+def test_stored_blocks_are_returned_as_bytes(tmp_path):
+    path = write_mdx(tmp_path / "plain.mdx", sample_entries(10), compress=False)
+    write_mdd(tmp_path / "plain.mdd", [("\\x.bin", b"\x00\x01\x02")], compress=False)
+    with IndexBuilder(str(path)) as builder:
+        assert builder.mdx_lookup("word000003") == [
+            "<div class='def'>definition of word000003</div>"
+        ]
+        data = builder.mdd_lookup("\\x.bin")
+        assert data == [b"\x00\x01\x02"] and isinstance(data[0], bytes)
+
+
+@pytest.mark.parametrize(
+    "encoding, data",
+    [
+        ("UTF-8", "<p>café</p>\x00".encode("utf-8")),
+        ("UTF-8", b"<p>broken \xff\xfe utf-8</p>\x00\x00"),
+        ("UTF-16", "<p>ĀĀ</p>\x00".encode("utf-16-le")),
+        ("UTF-16", "<p>odd</p>".encode("utf-16-le") + b"\x00"),
+        ("GB18030", "<p>汉字</p>\x00".encode("gb18030")),
+    ],
+)
+def test_record_decoding_matches_reencoding_path(mdx_path, encoding, data):
+    with IndexBuilder(str(mdx_path)) as builder:
+        builder._encoding = encoding
+        # the previous decode -> strip -> encode UTF-8 -> decode path
+        expected = data.decode(encoding, errors="ignore").strip("\x00").encode("utf-8")
+        assert builder._decode_mdx_record(memoryview(data)) == expected.decode("utf-8")
+        assert builder._decode_mdx_record(bytearray(data)) == expected.decode("utf-8")
+
+
+def test_stylesheet_is_substituted(tmp_path):
+    entries = [("styled", "`1`bold`2`plain\n`1`tail")]
+    path = write_mdx(tmp_path / "style.mdx", entries, compress=False)
+    with IndexBuilder(str(path)) as builder:
+        builder._stylesheet = {"1": ("<b>", "</b>"), "2": ("", "")}
+        assert builder.mdx_lookup("styled") == ["<b>bold</b>plain\r\n<b>tail</b>"]
+        assert builder.mdx_lookup_many(["styled"]) == [["<b>bold</b>plain\r\n<b>tail</b>"]]
+
+
+def test_lookup_many_returns_results_in_input_order(mdx_path):
+    with IndexBuilder(str(mdx_path)) as builder:
+        words = ["word000150", "missing", "word000003", "word000150", "zebra"]
+        assert builder.mdx_lookup_many(words) == [builder.mdx_lookup(w) for w in words]
+        assert builder.mdx_lookup_many(["ZEBRA", "Word000003"], ignorecase=True) == [
+            ["<b>zebra</b>"],
+            ["<div class='def'>definition of word000003</div>"],
+        ]
+        assert builder.mdx_lookup_many([]) == []
+
+
+def test_lookup_many_decompresses_each_block_once(mdx_path, monkeypatch):
+    builder = IndexBuilder(str(mdx_path), block_cache_size=0, partial_decompress=False)
+    calls = []
+    decompress = builder.decompress_block
+
+    def counting(block, index):
+        calls.append(index["file_pos"])
+        return decompress(block, index)
+
+    monkeypatch.setattr(builder, "decompress_block", counting)
+    words = [f"word{i:06d}" for i in reversed(range(0, 200, 3))]
+    results = builder.mdx_lookup_many(words)
+    builder.close()
+
+    assert all(len(r) == 1 for r in results)
+    # 202 records in blocks of 20; the two extra headwords sort first
+    assert len(calls) == len(set(calls)) == 11
+    assert calls == sorted(calls)
+
+
+def test_lookup_many_splits_long_keyword_lists(mdx_path):
+    with IndexBuilder(str(mdx_path)) as builder:
+        words = [f"word{i % 200:06d}" for i in range(2500)]
+        results = builder.mdx_lookup_many(words)
+        assert [r[0] for r in results[:3]] == [builder.mdx_lookup(w)[0] for w in words[:3]]
+        assert all(results)
+
+
+@pytest.fixture
+def accented_path(tmp_path):
+    entries = [
+        ("Apple", "<p>Apple</p>"),
+        ("apple", "<p>apple</p>"),
+        ("café", "<p>café</p>"),
+        ("e-mail", "<p>e-mail</p>"),
+        ("ice cream", "<p>ice cream</p>"),
+    ]
+    return write_mdx(tmp_path / "accents.mdx", entries)
+
+
+@pytest.mark.parametrize(
+    "word, expected",
+    [
+        ("Apple", ["<p>Apple</p>"]),  # exact match wins over the case-folded one
+        ("APPLE", ["<p>Apple</p>", "<p>apple</p>"]),
+        ("Café", ["<p>café</p>"]),
+        ("email", ["<p>e-mail</p>"]),
+        ("Ice-Cream", ["<p>ice cream</p>"]),
+        ("cafe", ["<p>café</p>"]),
+        ("coffee", []),
+    ],
+)
+def test_normalized_lookup_tiers(accented_path, word, expected):
+    with IndexBuilder(str(accented_path)) as builder:
+        assert builder.mdx_lookup_normalized(word) == expected
+        assert builder.mdx_lookup_normalized_many([word, word]) == [expected, expected]
+
+
+def test_normalized_lookup_uses_indexes(accented_path):
+    with IndexBuilder(str(accented_path)) as builder:
+        conn = builder._connection(builder._mdx_db)
+        for column in ("key_lower", "key_strip", "key_fold"):
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM KEYS WHERE {column} = ?", ("x",)
+            ).fetchall()
+            assert f"{column}_index" in str(plan)
+
+
+def _downgrade_to_flat_index(db, version=None):
+    """Rewrite a 2.1 index file into the single MDX_INDEX table used before 2.0
+
+    version None drops META, as in .mdd.db files; "1.2" keeps the normalized key columns.
+    """
+    normalized = ", k.key_lower, k.key_strip, k.key_fold" if version == "1.2" else ""
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE TABLE MDX_INDEX AS SELECT k.key_text, b.file_path, b.file_pos,"
+            " b.compressed_size, b.decompressed_size, b.record_block_type,"
+            f" k.record_start, k.record_end, b.offset{normalized}"
+            " FROM KEYS k JOIN BLOCKS b ON b.block_id = k.block_id ORDER BY k.rowid"
+        )
+        conn.execute("DROP TABLE KEYS")
+        conn.execute("DROP TABLE BLOCKS")
+        conn.execute("DROP TABLE IF EXISTS LINKS")
+        conn.execute("CREATE INDEX key_index ON MDX_INDEX (key_text)")
+        if version:
+            conn.execute("UPDATE META SET value = ? WHERE key = 'version'", (version,))
+        else:
+            conn.execute("DROP TABLE META")
+    conn.close()
+
+
+def _tables(db):
+    conn = sqlite3.connect(db)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+    return names
+
+
+def test_block_values_are_stored_once(mdx_path):
+    IndexBuilder(str(mdx_path)).close()
+    conn = sqlite3.connect(str(mdx_path) + ".db")
+    # 202 records in blocks of 20
+    assert conn.execute("SELECT COUNT(*) FROM BLOCKS").fetchone() == (11,)
+    assert conn.execute("SELECT COUNT(*) FROM KEYS").fetchone() == (202,)
+    conn.close()
+
+    conn = sqlite3.connect(str(mdx_path.with_suffix(".mdd.db")))
+    rows = conn.execute("SELECT block_id, file_path FROM BLOCKS ORDER BY block_id").fetchall()
+    assert [block_id for block_id, _ in rows] == [1, 2]
+    assert rows[0][1].endswith("sample.mdd") and rows[1][1].endswith("sample.1.mdd")
+    assert conn.execute("SELECT value FROM META WHERE key = 'version'").fetchone() == ("2.1",)
+    conn.close()
+
+
+def test_flat_index_is_migrated_in_place(mdx_path):
+    IndexBuilder(str(mdx_path)).close()
+    mdx_db = str(mdx_path) + ".db"
+    mdd_db = str(mdx_path.with_suffix(".mdd.db"))
+    conn = sqlite3.connect(mdx_db)
+    expected = conn.execute("SELECT key_text, record_start FROM KEYS ORDER BY rowid").fetchall()
+    conn.close()
+    _downgrade_to_flat_index(mdx_db, "1.2")
+    _downgrade_to_flat_index(mdd_db)
+
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder._version == "2.1"
+        assert builder.mdx_lookup_normalized("WORD000042") == [
+            "<div class='def'>definition of word000042</div>"
+        ]
+        assert builder.mdd_lookup("\\img\\b.png") == [b"\x89PNG-b"]
+    assert _tables(mdx_db) == {"BLOCKS", "KEYS", "LINKS", "META"}
+    assert _tables(mdd_db) == {"BLOCKS", "KEYS", "META"}
+    conn = sqlite3.connect(mdx_db)
+    assert conn.execute("SELECT key_text, record_start FROM KEYS ORDER BY rowid").fetchall() == (
+        expected
+    )
+    conn.close()
+
+
+def test_old_index_is_migrated_in_place(accented_path):
+    IndexBuilder(str(accented_path)).close()
+    db = str(accented_path) + ".db"
+    # 1.1 layout: flat table without the normalized key columns
+    _downgrade_to_flat_index(db, "1.1")
+
+    with IndexBuilder(str(accented_path)) as builder:
+        assert builder._version == "2.1"
+        assert builder.mdx_lookup_normalized("CAFE") == ["<p>café</p>"]
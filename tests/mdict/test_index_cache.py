@@ -0,0 +1,146 @@
+"""Tests for IndexBuilder(index_dir=...): the central, content-addressed index cache"""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from fixtures.mdict_writer import sample_entries, write_mdd, write_mdx
+
+from mdxscraper.mdict import IndexBuilder
+
+import mdict_query  # isort: skip
+from mdict_fingerprint import content_key  # isort: skip
+from mdict_index_cache import IndexCache  # isort: skip
+from mdict_lock import FileLock  # isort: skip
+
+
+def _write_dictionary(directory, name, count=100):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = write_mdx(directory / f"{name}.mdx", sample_entries(count, prefix=name))
+    write_mdd(directory / f"{name}.mdd", [("\\img\\a.png", f"{name}-a".encode())])
+    write_mdd(directory / f"{name}.1.mdd", [("\\img\\b.png", f"{name}-b".encode())])
+    return path
+
+
+def _entries(cache):
+    """The entry directories of cache, without the lock files beside them."""
+    return sorted(str(p) for p in Path(cache).iterdir() if p.is_dir())
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    built = []
+    make_index = mdict_query.IndexBuilder._make_index
+
+    def counting(self, db):
+        built.append(self._index_kinds[db])
+        make_index(self, db)
+
+    monkeypatch.setattr(mdict_query.IndexBuilder, "_make_index", counting)
+    return built
+
+
+def test_indexes_are_written_to_the_cache(tmp_path):
+    path = _write_dictionary(tmp_path / "library", "sample")
+    cache = tmp_path / "cache"
+    with IndexBuilder(str(path), index_dir=str(cache)) as builder:
+        assert builder.mdx_lookup("sample000042") == [
+            "<div class='def'>definition of sample000042</div>"
+        ]
+        assert builder.mdd_lookup("\\img\\b.png") == [b"sample-b"]
+    assert not list((tmp_path / "library").glob("*.db"))
+    (entry,) = map(Path, _entries(cache))
+    assert sorted(p.name for p in entry.glob("*.db")) == ["index.mdd.db", "index.mdx.db"]
+
+
+def test_renamed_copy_reuses_the_index(tmp_path, builds):
+    path = _write_dictionary(tmp_path / "library", "sample")
+    cache = str(tmp_path / "cache")
+    IndexBuilder(str(path), index_dir=cache).close()
+    assert builds == ["mdx", "mdd"]
+
+    copy = tmp_path / "local"
+    copy.mkdir()
+    for source, target in (("sample.mdx", "copy.mdx"), ("sample.mdd", "copy.mdd")):
+        shutil.copy(tmp_path / "library" / source, copy / target)
+    shutil.copy(tmp_path / "library" / "sample.1.mdd", copy / "copy.1.mdd")
+    shutil.rmtree(tmp_path / "library")
+
+    with IndexBuilder(str(copy / "copy.mdx"), index_dir=cache, backend="binary") as builder:
+        assert builder.mdx_lookup("sample000007") == [
+            "<div class='def'>definition of sample000007</div>"
+        ]
+        # the volumes are read from the copy, not the recorded paths
+        assert builder.mdd_lookup("\\img\\a.png") == [b"sample-a"]
+        assert builder.mdd_lookup("\\img\\b.png") == [b"sample-b"]
+    assert builds == ["mdx", "mdd"]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = tmp_path / "cache"
+    entries = []
+    for age, name in ((300, "a"), (100, "b"), (200, "c")):
+        path = _write_dictionary(tmp_path / name, name)
+        IndexBuilder(str(path), index_dir=str(cache)).close()
+        entry = cache / content_key(str(path))
+        os.utime(entry, (10**9 - age, 10**9 - age))
+        entries.append(entry)
+    size = sum(f.stat().st_size for f in entries[1].iterdir())
+
+    # room for about two entries: "a", unused the longest, goes
+    removed = IndexCache(str(cache), max_size=size * 2 + size // 2).evict()
+    assert removed == [str(entries[0])]
+    assert _entries(cache) == sorted(map(str, entries[1:]))
+
+
+def test_open_entries_are_not_evicted(tmp_path):
+    cache = str(tmp_path / "cache")
+    first = _write_dictionary(tmp_path / "a", "a")
+    second = _write_dictionary(tmp_path / "b", "b")
+    with IndexBuilder(str(first), index_dir=cache) as held:
+        # a cap too small for any entry, but both are held while the second opens
+        with IndexBuilder(str(second), index_dir=cache, index_cache_size=1):
+            assert len(_entries(cache)) == 2
+        assert IndexCache(cache, max_size=1).evict() == [os.path.join(cache, content_key(second))]
+        assert held.mdx_lookup("a000001") == ["<div class='def'>definition of a000001</div>"]
+    assert IndexCache(cache, max_size=1).evict() == [os.path.join(cache, content_key(first))]
+    assert _entries(cache) == []
+
+
+def test_entries_held_by_another_process_are_not_evicted(tmp_path):
+    cache = str(tmp_path / "cache")
+    path = _write_dictionary(tmp_path / "a", "a")
+    IndexBuilder(str(path), index_dir=cache).close()
+    entry = os.path.join(cache, content_key(str(path)))
+    # what an IndexBuilder of another process holds on its entry
+    other = FileLock(entry + ".lock", shared=True)
+    assert other.acquire(timeout=0)
+    try:
+        assert IndexCache(cache, max_size=1).evict() == []
+        assert _entries(cache) == [entry]
+    finally:
+        other.release()
+    assert IndexCache(cache, max_size=1).evict() == [entry]
+
+
+def test_entries_that_cannot_be_moved_aside_are_kept_whole(tmp_path, monkeypatch):
+    cache = str(tmp_path / "cache")
+    path = _write_dictionary(tmp_path / "a", "a")
+    IndexBuilder(str(path), index_dir=cache).close()
+    entry = Path(cache, content_key(str(path)))
+    files = sorted(p.name for p in entry.iterdir())
+
+    def refuse(src, dst):
+        # Windows, with a file of the entry open in another process
+        raise PermissionError(src)
+
+    monkeypatch.setattr(os, "rename", refuse)
+    assert IndexCache(cache, max_size=1).evict() == []
+    assert sorted(p.name for p in entry.iterdir()) == files
+    monkeypatch.undo()
+
+    assert IndexCache(cache, max_size=1).evict() == [str(entry)]
+    assert list(Path(cache).glob("*.evicted")) == []
@@ -0,0 +1,167 @@
+"""Tests for lock-coordinated index builds shared by concurrent builders and processes"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+from mdxscraper.mdict import IndexBuilder
+
+import mdict_lock  # isort: skip
+import mdict_query  # isort: skip
+from mdict_fingerprint import content_key  # isort: skip
+from mdict_lock import FileLock  # isort: skip
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+
+@pytest.fixture
+def mdd_volumes():
+    return [[("\\img\\a.png", b"\x89PNG-a")]]
+
+
+@pytest.fixture(autouse=True)
+def lock_dir(tmp_path, monkeypatch):
+    path = tmp_path / "locks"
+    monkeypatch.setattr(mdict_lock, "LOCK_DIR", str(path))
+    return path
+
+
+def _build_lock(mdx_path, index_name):
+    """The lock an IndexBuilder takes to build the index file index_name of mdx_path."""
+    return FileLock(mdict_lock.lock_path(index_name, content_key(str(mdx_path))))
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    built = []
+    make_index = mdict_query.IndexBuilder._make_index
+
+    def counting(self, db):
+        built.append(self._index_kinds[db])
+        make_index(self, db)
+
+    monkeypatch.setattr(mdict_query.IndexBuilder, "_make_index", counting)
+    return built
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "x.lock")
+    first, second = FileLock(path), FileLock(path)
+    assert first.acquire(timeout=0)
+    assert not second.acquire(timeout=0.1)
+    first.release()
+    assert second.acquire(timeout=0)
+    second.release()
+
+
+def test_shared_locks_exclude_only_exclusive_ones(tmp_path):
+    path = str(tmp_path / "x.lock")
+    readers = [FileLock(path, shared=True) for _ in range(2)]
+    assert all(reader.acquire(timeout=0) for reader in readers)
+    writer = FileLock(path)
+    assert not writer.acquire(timeout=0)
+    for reader in readers:
+        reader.release()
+    assert writer.acquire(timeout=0)
+    assert not FileLock(path, shared=True).acquire(timeout=0)
+    writer.release()
+
+
+def test_waiting_builder_uses_the_index_built_meanwhile(mdx_path, builds):
+    # an index built elsewhere, put in place while this builder waits for the lock
+    IndexBuilder(str(mdx_path)).close()
+    db = Path(str(mdx_path) + ".db")
+    built = db.read_bytes()
+    db.unlink()
+    del builds[:]
+
+    lock = _build_lock(mdx_path, db.name)
+    assert lock.acquire(timeout=0)
+    result = []
+    opener = threading.Thread(
+        target=lambda: result.append(IndexBuilder(str(mdx_path))), name="opener"
+    )
+    opener.start()
+    opener.join(0.3)
+    assert opener.is_alive()
+    db.write_bytes(built)
+    lock.release()
+    opener.join(10)
+
+    (builder,) = result
+    assert builder.mdx_lookup("word000003") == ["<div class='def'>definition of word000003</div>"]
+    builder.close()
+    assert builds == []
+
+
+def test_lock_timeout_falls_back_to_index_free_lookups(mdx_path, builds):
+    lock = _build_lock(mdx_path, "sample.mdx.db")
+    assert lock.acquire(timeout=0)
+    try:
+        builder = IndexBuilder(str(mdx_path), lock_timeout=0.1)
+        assert builder.mdx_lookup("word000003") == [
+            "<div class='def'>definition of word000003</div>"
+        ]
+        assert builds == ["mdd"]
+    finally:
+        lock.release()
+    assert builder.wait_for_index(10)
+    assert builds == ["mdd", "mdx"]
+    assert builder._mdx_db == str(mdx_path) + ".db"
+    builder.close()
+
+
+def test_lock_files_are_kept_out_of_the_dictionary_folder(mdx_path, lock_dir):
+    IndexBuilder(str(mdx_path), bloom_error_rate=0.01, backend="binary").close()
+    assert list(mdx_path.parent.glob("*.lock")) == []
+    key = content_key(str(mdx_path))
+    assert sorted(p.name for p in lock_dir.iterdir()) == [
+        f"{key}.sample.mdd.db.lock",
+        f"{key}.sample.mdd.idx.lock",
+        f"{key}.sample.mdx.bloom.lock",
+        f"{key}.sample.mdx.db.lock",
+        f"{key}.sample.mdx.idx.lock",
+    ]
+
+
+def test_concurrent_processes_build_each_index_once(mdx_path, tmp_path):
+    log = tmp_path / "builds.log"
+    script = textwrap.dedent(
+        f"""
+        import sys, time
+        sys.path.insert(0, {str(SRC)!r})
+        from mdxscraper.mdict import IndexBuilder
+        import mdict_query
+
+        make_index = mdict_query.IndexBuilder._make_index
+
+        def logged(self, db):
+            with open({str(log)!r}, "a") as f:
+                f.write(db + "\\n")
+            # slow enough for the other process to arrive while this one builds
+            time.sleep(0.5)
+            make_index(self, db)
+
+        mdict_query.IndexBuilder._make_index = logged
+        with IndexBuilder({str(mdx_path)!r}) as builder:
+            print(builder.mdx_lookup("word000099")[0])
+        """
+    )
+    processes = [
+        subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True)
+        for _ in range(2)
+    ]
+    outputs = [process.communicate(timeout=60)[0] for process in processes]
+    assert [process.returncode for process in processes] == [0, 0]
+    assert outputs == ["<div class='def'>definition of word000099</div>\n"] * 2
+    assert list(mdx_path.parent.glob("*.lock")) == []
+    assert sorted(Path(line).name for line in log.read_text().splitlines()) == [
+        "sample.mdd.db",
+        "sample.mdx.db",
+    ]
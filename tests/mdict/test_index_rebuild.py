@@ -0,0 +1,219 @@
+"""Tests for index validation against the dictionary files and background rebuilds"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+
+import pytest
+from fixtures.mdict_writer import sample_entries, write_mdd, write_mdx
+
+from mdxscraper.mdict import IndexBuilder
+
+import mdict_query  # isort: skip
+
+
+def _entries(definition="definition"):
+    return [(key, value.replace("definition", definition)) for key, value in sample_entries(100)]
+
+
+@pytest.fixture
+def mdx_entries():
+    return _entries()
+
+
+@pytest.fixture
+def mdx_options():
+    return {"records_per_block": 20, "compress": False}
+
+
+@pytest.fixture
+def mdd_volumes():
+    return [[("\\img\\a.png", b"\x89PNG-a")], [("\\img\\b.png", b"\x89PNG-b")]]
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Record the index dbs built, by kind."""
+    built = []
+    make_index = mdict_query.IndexBuilder._make_index
+
+    def counting(self, db):
+        built.append(self._index_kinds[db])
+        make_index(self, db)
+
+    monkeypatch.setattr(mdict_query.IndexBuilder, "_make_index", counting)
+    return built
+
+
+def _meta(db, key):
+    with sqlite3.connect(db) as conn:
+        row = conn.execute("SELECT value FROM META WHERE key = ?", (key,)).fetchone()
+    conn.close()
+    return row and row[0]
+
+
+def _replace_mdx(path, definition):
+    """Rewrite the (uncompressed) .mdx with other records of the same size and a later mtime."""
+    size = path.stat().st_size
+    mtime = path.stat().st_mtime_ns
+    write_mdx(path, _entries(definition), records_per_block=20, compress=False)
+    assert path.stat().st_size == size
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def test_index_records_its_sources(mdx_path):
+    IndexBuilder(str(mdx_path)).close()
+    mdx_sources = json.loads(_meta(str(mdx_path) + ".db", "sources"))
+    assert [entry["name"] for entry in mdx_sources] == ["sample.mdx"]
+    assert mdx_sources[0]["size"] == mdx_path.stat().st_size
+    assert mdx_sources[0]["mtime_ns"] == mdx_path.stat().st_mtime_ns
+    mdd_sources = json.loads(_meta(str(mdx_path.with_suffix(".mdd.db")), "sources"))
+    assert [entry["name"] for entry in mdd_sources] == ["sample.mdd", "sample.1.mdd"]
+
+
+def test_current_index_is_reused(mdx_path, builds):
+    IndexBuilder(str(mdx_path)).close()
+    assert builds == ["mdx", "mdd"]
+    IndexBuilder(str(mdx_path)).close()
+    assert builds == ["mdx", "mdd"]
+
+
+def test_replaced_mdx_is_reindexed(mdx_path, builds):
+    IndexBuilder(str(mdx_path)).close()
+    _replace_mdx(mdx_path, "meaningsof")
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdx_lookup("word000042") == [
+            "<div class='def'>meaningsof of word000042</div>"
+        ]
+    assert builds == ["mdx", "mdd", "mdx"]
+
+
+def test_touched_mdx_is_rehashed_not_reindexed(mdx_path, builds):
+    IndexBuilder(str(mdx_path)).close()
+    db = mdx_path.parent / "sample.mdx.db"
+    built = db.read_bytes()
+    mtime = mdx_path.stat().st_mtime_ns + 10**9
+    os.utime(mdx_path, ns=(mtime, mtime))
+    IndexBuilder(str(mdx_path)).close()
+    assert builds == ["mdx", "mdd"]
+    # the index file is left as built: readers may have it open immutable
+    assert db.read_bytes() == built
+
+
+def test_new_mdd_volume_rebuilds_the_mdd_index(mdx_path, builds):
+    IndexBuilder(str(mdx_path)).close()
+    write_mdd(mdx_path.with_suffix(".2.mdd"), [("\\img\\c.png", b"\x89PNG-c")])
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdd_lookup("\\img\\c.png") == [b"\x89PNG-c"]
+    assert builds == ["mdx", "mdd", "mdd"]
+
+
+def test_index_without_sources_is_adopted(mdx_path, builds):
+    IndexBuilder(str(mdx_path)).close()
+    db = str(mdx_path) + ".db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("DELETE FROM META WHERE key = 'sources'")
+    conn.close()
+    IndexBuilder(str(mdx_path)).close()
+    assert builds == ["mdx", "mdd"]
+    assert json.loads(_meta(db, "sources"))[0]["name"] == "sample.mdx"
+
+
+def test_corrupt_index_is_rebuilt(mdx_path, builds):
+    IndexBuilder(str(mdx_path)).close()
+    (mdx_path.parent / "sample.mdx.db").write_bytes(b"not a database" * 100)
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdx_lookup("word000001") == [
+            "<div class='def'>definition of word000001</div>"
+        ]
+    assert builds == ["mdx", "mdd", "mdx"]
+
+
+def test_failed_build_keeps_the_old_index(mdx_path, monkeypatch):
+    IndexBuilder(str(mdx_path)).close()
+    db = mdx_path.parent / "sample.mdx.db"
+    old = db.read_bytes()
+
+    def failing(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(mdict_query, "_insert_index", failing)
+    with pytest.raises(RuntimeError):
+        IndexBuilder(str(mdx_path), force_rebuild=True)
+    assert db.read_bytes() == old
+    assert not list(mdx_path.parent.glob("*.tmp*"))
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """Hold index builds until the returned event is set."""
+    event = threading.Event()
+    make_mdx_index = mdict_query.IndexBuilder._make_mdx_index
+
+    def gated(self, db_name):
+        assert event.wait(10)
+        make_mdx_index(self, db_name)
+
+    monkeypatch.setattr(mdict_query.IndexBuilder, "_make_mdx_index", gated)
+    return event
+
+
+def test_background_rebuild_serves_sparse_lookups_meanwhile(mdx_path, gate):
+    builder = IndexBuilder(str(mdx_path), background_rebuild=True)
+    try:
+        assert builder.mdx_lookup("word000042") == [
+            "<div class='def'>definition of word000042</div>"
+        ]
+        assert builder.mdd_lookup("\\img\\b.png") == [b"\x89PNG-b"]
+        assert not (mdx_path.parent / "sample.mdx.db").exists()
+        gate.set()
+        assert builder.wait_for_index(10)
+        assert builder._mdx_db == str(mdx_path) + ".db"
+        assert builder.mdx_lookup("word000042") == [
+            "<div class='def'>definition of word000042</div>"
+        ]
+    finally:
+        gate.set()
+        builder.close()
+
+
+def test_background_rebuild_swaps_a_stale_index(mdx_path, gate):
+    gate.set()
+    IndexBuilder(str(mdx_path)).close()
+    gate.clear()
+    _replace_mdx(mdx_path, "meaningsof")
+    builder = IndexBuilder(str(mdx_path), background_rebuild=True)
+    try:
+        assert builder.mdx_lookup("word000042") == [
+            "<div class='def'>meaningsof of word000042</div>"
+        ]
+        gate.set()
+        assert builder.wait_for_index(10)
+        assert builder.mdx_lookup("word000042") == [
+            "<div class='def'>meaningsof of word000042</div>"
+        ]
+    finally:
+        gate.set()
+        builder.close()
+
+
+def test_lookups_wait_for_the_rebuild_without_sparse_fallback(mdx_path, gate):
+    builder = IndexBuilder(
+        str(mdx_path), background_rebuild=True, sparse_while_rebuilding=False, backend="binary"
+    )
+    results = []
+    lookup = threading.Thread(target=lambda: results.append(builder.mdx_lookup("word000007")))
+    try:
+        lookup.start()
+        lookup.join(0.2)
+        assert lookup.is_alive() and not results
+        gate.set()
+        lookup.join(10)
+        assert results == [["<div class='def'>definition of word000007</div>"]]
+        assert (mdx_path.parent / "sample.mdx.idx").exists()
+    finally:
+        gate.set()
+        builder.close()
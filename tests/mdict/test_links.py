@@ -0,0 +1,105 @@
+"""Tests for @@@LINK= redirects resolved into the LINKS table while indexing"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+from fixtures.mdict_writer import sample_entries
+
+from mdxscraper.core.dictionary import Dictionary
+from mdxscraper.mdict import IndexBuilder
+
+import mdict_query  # isort: skip
+
+REDIRECTS = [
+    ("color", "@@@LINK=colour"),
+    ("colour", "<p>colour</p>"),
+    # a chain of three hops, the last one through the case-folded tier
+    ("first", "@@@LINK=second\r\n"),
+    ("second", "@@@LINK=third"),
+    ("third", "@@@LINK=Final"),
+    ("final", "<p>final</p>"),
+    ("ping", "@@@LINK=pong"),
+    ("pong", "@@@LINK=ping"),
+    ("gone", "@@@LINK=nowhere"),
+]
+WORDS = ["color", "FIRST", "second", "ping", "gone", "colour", "word000007", "missing"]
+EXPECTED = [
+    ["<p>colour</p>"],
+    ["<p>final</p>"],
+    ["<p>final</p>"],
+    [],
+    [],
+    ["<p>colour</p>"],
+    ["<div class='def'>definition of word000007</div>"],
+    [],
+]
+
+
+@pytest.fixture
+def mdx_entries():
+    return sorted(sample_entries(100) + REDIRECTS)
+
+
+@pytest.fixture
+def mdx_options():
+    return {"records_per_block": 8}
+
+
+def _links(db):
+    conn = sqlite3.connect(db)
+    rows = conn.execute(
+        "SELECT k.key_text, t.key_text FROM LINKS l JOIN KEYS k ON k.rowid = l.key_row"
+        " LEFT JOIN KEYS t ON t.rowid = l.target_row ORDER BY k.key_text"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def test_chains_are_resolved_when_indexing(mdx_path):
+    IndexBuilder(str(mdx_path)).close()
+    assert _links(str(mdx_path) + ".db") == [
+        ("color", "colour"),
+        ("first", "final"),
+        ("gone", None),
+        ("ping", None),
+        ("pong", None),
+        ("second", "final"),
+        ("third", "final"),
+    ]
+
+
+def test_redirects_read_their_target(mdx_path, monkeypatch):
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert [builder.mdx_lookup_normalized(word) for word in WORDS] == EXPECTED
+        assert builder.mdx_lookup_normalized_many(WORDS) == EXPECTED
+        monkeypatch.setattr(mdict_query, "BULK_LOOKUP_MIN", 0)
+        assert builder.mdx_lookup_normalized_many(WORDS) == EXPECTED
+        # the raw records stay available
+        assert builder.mdx_lookup_normalized("color", resolve_links=False) == ["@@@LINK=colour"]
+        assert builder.mdx_lookup("color") == ["@@@LINK=colour"]
+
+
+def test_dictionary_follows_redirects_without_links_table(mdx_path):
+    expected = [found[0] if found else "" for found in EXPECTED]
+    for backend in ("sqlite", "sparse"):
+        with Dictionary(mdx_path, backend=backend) as dictionary:
+            assert [dictionary.lookup_html(word) for word in WORDS] == expected
+            assert dictionary.lookup_html_many(WORDS) == expected
+
+
+def test_2_0_index_gains_links_in_place(mdx_path):
+    IndexBuilder(str(mdx_path)).close()
+    db = str(mdx_path) + ".db"
+    expected = _links(db)
+    conn = sqlite3.connect(db)
+    conn.execute("DROP TABLE LINKS")
+    conn.execute("UPDATE META SET value = '2.0' WHERE key = 'version'")
+    conn.commit()
+    conn.close()
+
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder._version == "2.1"
+        assert builder.mdx_lookup_normalized("color") == ["<p>colour</p>"]
+    assert _links(db) == expected
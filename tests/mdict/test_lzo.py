@@ -0,0 +1,77 @@
+"""Tests for the vendored LZO1X decompressor and LZO-compressed (engine < 2.0 style) blocks"""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+from fixtures.lzo1x import compress
+from fixtures.mdict_writer import sample_entries, write_mdd, write_mdx
+
+from mdxscraper.mdict import IndexBuilder
+
+import lzo  # isort: skip
+from readmdict import MDD, MDX  # isort: skip
+
+_rng = random.Random(7)
+_RANDOM = _rng.randbytes(20000)
+
+CASES = {
+    "empty": b"",
+    "one byte": b"a",
+    "short literal run": b"abc",
+    "first literal run": b"abcdefgh",
+    "long literal run": _RANDOM[:5000],
+    "run of one byte": b"a" * 1000,
+    "overlapping pattern": b"abc" * 777,
+    "zeros then literals": bytes(300) + _RANDOM[:5],
+    "text": b"".join(f"<p>entry {i} of the list</p>".encode() for i in range(2000)),
+    # a repeat 20000 bytes back needs an M4 match with an extended length
+    "far match": _RANDOM + _RANDOM,
+}
+
+
+@pytest.mark.parametrize("data", CASES.values(), ids=CASES.keys())
+def test_round_trip(data):
+    assert lzo.decompress(compress(data), initSize=len(data)) == data
+
+
+@pytest.mark.parametrize("init_size", [0, 1, 100, 100_000])
+def test_output_size_hint_is_not_trusted(init_size):
+    data = CASES["text"]
+    assert lzo.decompress(compress(data), initSize=init_size) == data
+
+
+def test_accepts_buffers():
+    data = CASES["overlapping pattern"]
+    stream = compress(data)
+    assert lzo.decompress(memoryview(stream), initSize=len(data)) == data
+    assert lzo.decompress(bytearray(stream), initSize=len(data)) == data
+
+
+def test_truncated_input_raises():
+    stream = compress(CASES["text"])
+    with pytest.raises(lzo.LzoError):
+        lzo.decompress(stream[: len(stream) // 2])
+
+
+def test_lookbehind_overrun_raises():
+    # a 3-byte match 1 byte back with no output yet
+    with pytest.raises(lzo.LzoError):
+        lzo.decompress(b"\x40\x00\x11\x00\x00")
+
+
+def test_lzo_mdx_lookup(tmp_path):
+    path = write_mdx(tmp_path / "lzo.mdx", sample_entries(200), compress="lzo")
+    records = dict(MDX(str(path)).items())
+    assert records[b"word000150"] == b"<div class='def'>definition of word000150</div>"
+    with IndexBuilder(str(path), check=True) as builder:
+        assert builder.mdx_lookup("word000199") == [
+            "<div class='def'>definition of word000199</div>"
+        ]
+
+
+def test_lzo_mdd_items(tmp_path):
+    resources = [(f"\\img{i}.png", bytes([i]) * 300) for i in range(20)]
+    path = write_mdd(tmp_path / "lzo.mdd", resources, compress="lzo")
+    assert dict(MDD(str(path)).items()) == {name.encode("utf-8"): data for name, data in resources}
@@ -0,0 +1,91 @@
+"""Tests for parallel indexing of multi-volume .mdd resource sets"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+from fixtures.mdict_writer import sample_entries
+
+from mdxscraper.mdict import IndexBuilder
+
+VOLUMES = 3
+
+
+def _resources(volume, count=40):
+    return [
+        (f"\\img\\v{volume}-{i:03d}.png", f"volume {volume} image {i}".encode())
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def mdx_entries():
+    return sample_entries(20)
+
+
+@pytest.fixture
+def mdx_options():
+    return {}
+
+
+@pytest.fixture
+def mdd_volumes():
+    return [_resources(volume) for volume in range(VOLUMES)]
+
+
+@pytest.fixture
+def mdd_options():
+    return {"records_per_block": 8}
+
+
+def _rows(db):
+    with sqlite3.connect(db) as conn:
+        blocks = conn.execute("SELECT * FROM BLOCKS ORDER BY block_id").fetchall()
+        keys = conn.execute("SELECT * FROM KEYS ORDER BY rowid").fetchall()
+    conn.close()
+    return blocks, keys
+
+
+def test_parallel_build_matches_serial_build(mdx_path):
+    db = str(mdx_path.with_suffix(".mdd.db"))
+    IndexBuilder(str(mdx_path), workers=1).close()
+    serial = _rows(db)
+    with IndexBuilder(str(mdx_path), workers=VOLUMES, force_rebuild=True) as builder:
+        assert builder.mdd_lookup("\\img\\v2-007.png") == [b"volume 2 image 7"]
+        assert builder.mdd_lookup("\\img\\v0-039.png") == [b"volume 0 image 39"]
+    assert _rows(db) == serial
+    assert not list(mdx_path.parent.glob("*.tmp*"))
+
+
+def test_progress_is_reported_per_volume(mdx_path):
+    progress = []
+    IndexBuilder(
+        str(mdx_path),
+        workers=VOLUMES,
+        progress_callback=lambda name, done, total: progress.append((name, done, total)),
+    ).close()
+    finished = {name for name, done, total in progress if done == total}
+    assert finished == {str(mdx_path)} | {str(path) for path in mdx_path.parent.glob("*.mdd")}
+
+
+def test_failed_volume_fails_the_build(mdx_path):
+    (mdx_path.parent / "sample.1.mdd").write_bytes(b"not an mdd file")
+    with pytest.raises(Exception):
+        IndexBuilder(str(mdx_path), workers=VOLUMES)
+    assert not (mdx_path.parent / "sample.mdd.db").exists()
+    assert not list(mdx_path.parent.glob("*.tmp*"))
+
+
+def test_merged_block_ids_follow_the_volume_order(mdx_path):
+    IndexBuilder(str(mdx_path), workers=VOLUMES).close()
+    with sqlite3.connect(str(mdx_path.with_suffix(".mdd.db"))) as conn:
+        order = [
+            row[0]
+            for row in conn.execute(
+                "SELECT file_path FROM BLOCKS GROUP BY file_path ORDER BY MIN(block_id)"
+            )
+        ]
+    conn.close()
+    names = ["sample.mdd"] + [f"sample.{volume}.mdd" for volume in range(1, VOLUMES)]
+    assert order == [str(mdx_path.parent / name) for name in names]
@@ -0,0 +1,157 @@
+"""Tests for the vendored readmdict reader: streamed key and record block indexing"""
+
+from __future__ import annotations
+
+import tracemalloc
+import zlib
+from struct import pack
+
+import pytest
+from fixtures.mdict_writer import sample_entries, write_mdd, write_mdx
+
+from mdxscraper.mdict import IndexBuilder
+
+# vendored top-level module, importable once mdxscraper.mdict has been imported
+import readmdict  # isort: skip
+from readmdict import MDD, MDX, KeyList, split_key_block  # isort: skip
+
+
+def test_key_list_is_a_compact_sequence():
+    keys = KeyList([(0, b"apple"), (12, b""), (40, "café".encode("utf-8"))])
+    assert len(keys) == 3
+    assert keys[0] == (0, b"apple")
+    assert keys[1] == (12, b"")
+    assert keys[-1] == (40, "café".encode("utf-8"))
+    assert list(keys) == [(0, b"apple"), (12, b""), (40, "café".encode("utf-8"))]
+
+
+def test_index_blocks_match_items(tmp_path):
+    path = write_mdx(tmp_path / "a.mdx", sample_entries(100), keys_per_block=7, records_per_block=9)
+    mdx = MDX(str(path))
+    records = dict(mdx.items())
+    blocks = list(mdx.get_index_blocks(check_block=True))
+    assert len(blocks) == 12  # 100 records in blocks of 9
+
+    with open(path, "rb") as f:
+        data = f.read()
+    seen = 0
+    for block, keys in blocks:
+        assert block["record_block_type"] == 2
+        compressed = data[block["file_pos"] : block["file_pos"] + block["compressed_size"]]
+        record_block = zlib.decompress(compressed[8:])
+        for key_text, record_start, record_end in keys:
+            start = record_start - block["offset"]
+            record = record_block[start : record_end - block["offset"]]
+            assert record.strip(b"\x00") == records[key_text.encode("utf-8")]
+            seen += 1
+    assert seen == len(mdx) == 100
+
+
+def test_get_index_is_lazy(tmp_path):
+    path = write_mdd(tmp_path / "a.mdd", [(f"\\f{i}.bin", bytes([i])) for i in range(10)])
+    mdd = MDD(str(path))
+    index = mdd.get_index(check_block=False)
+    assert not isinstance(index, list)
+    first = next(index)
+    assert first["key_text"] == "\\f0.bin"
+    assert first["record_end"] - first["record_start"] == 1
+    assert len(list(index)) == 9
+
+
+def test_check_block_detects_corruption(tmp_path):
+    path = write_mdx(tmp_path / "a.mdx", sample_entries(20), compress=False)
+    data = bytearray(path.read_bytes())
+    data[-5] ^= 0xFF  # inside the last (stored) record block
+    path.write_bytes(bytes(data))
+
+    mdx = MDX(str(path))
+    assert len(list(mdx.get_index_blocks(check_block=False))) == 2
+    with pytest.raises(AssertionError):
+        list(mdx.get_index_blocks(check_block=True))
+
+
+def _build_peak(tmp_path, entries):
+    path = write_mdx(tmp_path / f"big{entries}.mdx", sample_entries(entries), records_per_block=64)
+    tracemalloc.start()
+    IndexBuilder(str(path)).close()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def test_index_build_memory_does_not_grow_with_entries(tmp_path):
+    small = _build_peak(tmp_path, 10_000)
+    large = _build_peak(tmp_path, 80_000)
+    # one batch of rows plus one key block and one record block, whatever the size
+    assert large < 8 * 2**20
+    assert large < small * 1.5
+
+
+def test_parallel_verification_keeps_block_order(tmp_path):
+    path = write_mdx(tmp_path / "a.mdx", sample_entries(300), records_per_block=10)
+    mdx = MDX(str(path))
+    calls = []
+    serial = list(mdx.get_index_blocks(check_block=True, workers=1))
+    parallel = list(
+        mdx.get_index_blocks(check_block=True, workers=2, progress=lambda *a: calls.append(a))
+    )
+    assert parallel == serial
+    assert calls[-1] == (30, 30)
+    assert [done for done, _ in calls] == sorted(done for done, _ in calls)
+
+
+def test_parallel_verification_detects_corruption(tmp_path):
+    path = write_mdx(tmp_path / "a.mdx", sample_entries(200), records_per_block=10, compress=False)
+    data = bytearray(path.read_bytes())
+    data[-5] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(AssertionError):
+        list(MDX(str(path)).get_index_blocks(check_block=True, workers=2))
+
+
+def test_split_key_block_utf8():
+    block = (
+        pack(">Q", 0)
+        + b"apple\x00"
+        + pack(">Q", 7)
+        + " café ".encode("utf-8")
+        + b"\x00"
+        # key ids may contain NUL bytes; only the text is searched for the delimiter
+        + pack(">Q", 256)
+        + b"z\x00"
+    )
+    assert list(split_key_block(block, "UTF-8", ">Q", 8)) == [
+        (0, b"apple"),
+        (7, "café".encode("utf-8")),
+        (256, b"z"),
+    ]
+
+
+def test_split_key_block_utf16_delimiter_is_aligned():
+    # "aĀ" is 61 00 00 01: the unaligned "\x00\x00" inside it must not end the key
+    assert "aĀ".encode("utf-16-le").find(b"\x00\x00") == 1
+    block = pack(">I", 3) + "aĀ".encode("utf-16-le") + b"\x00\x00"
+    block += pack(">I", 9) + "ĀĀ".encode("utf-16-le") + b"\x00\x00"
+    assert list(split_key_block(block, "UTF-16", ">I", 4)) == [
+        (3, "aĀ".encode("utf-8")),
+        (9, "ĀĀ".encode("utf-8")),
+    ]
+
+
+def test_split_key_block_reencodes_legacy_encodings():
+    block = pack(">Q", 1) + "汉字".encode("gb18030") + b"\x00" + pack(">Q", 2) + b"ab\x00"
+    assert list(split_key_block(block, "GB18030", ">Q", 8)) == [
+        (1, "汉字".encode("utf-8")),
+        (2, b"ab"),
+    ]
+
+
+def test_parallel_key_decoding_matches_serial(tmp_path, monkeypatch):
+    entries = sample_entries(500) + [("zürich", "<p>z</p>")]
+    path = write_mdx(tmp_path / "a.mdx", entries, keys_per_block=8)
+    mdx = MDX(str(path))
+    monkeypatch.setattr(readmdict, "PARALLEL_KEY_BLOCKS", 4)
+    serial = list(mdx._iter_keys(workers=1))
+    assert list(mdx._iter_keys(workers=2)) == serial
+    assert len(serial) == 501 and serial[-1][1] == "zürich".encode("utf-8")
@@ -0,0 +1,116 @@
+"""Tests for IndexBuilder(backend="sparse"): lookups without an index database"""
+
+from __future__ import annotations
+
+import os
+import stat
+
+import pytest
+from fixtures.mdict_writer import mixed_case_entries, sample_entries, write_mdx
+
+from mdxscraper.core.dictionary import Dictionary
+from mdxscraper.mdict import IndexBuilder
+
+from readmdict import MDX  # isort: skip
+
+
+@pytest.fixture
+def mdx_entries():
+    return mixed_case_entries(300)
+
+
+@pytest.fixture
+def mdx_options():
+    return {"keys_per_block": 16, "records_per_block": 20}
+
+
+@pytest.fixture
+def mdd_volumes():
+    return [[("\\img\\a.png", b"\x89PNG-a")], [("\\img\\b.png", b"\x89PNG-b")]]
+
+
+WORDS = ["word000000", "word000015", "word000016", "word000299", "Apple", "apple", "missing"]
+NORMALIZED = WORDS + ["APPLE", "Ice Cream", "icecream", "CAFÉ"]
+
+
+def test_key_block_directory_holds_first_and_last_keys(mdx_path):
+    mdx = MDX(str(mdx_path))
+    ranges = mdx._key_block_ranges
+    assert len(ranges) == len(mdx._key_block_info_list) == 19
+    assert ranges[0] == ("Apple", "word000011")
+    assert ranges[-1] == ("word000284", "word000299")
+
+
+def test_sparse_lookups_match_the_sqlite_index(mdx_path):
+    path = str(mdx_path)
+    with IndexBuilder(path, backend="sparse") as sparse:
+        assert not list(mdx_path.parent.glob("*.db"))
+        with IndexBuilder(path) as indexed:
+            for word in WORDS:
+                assert sparse.mdx_lookup(word) == indexed.mdx_lookup(word)
+                assert sparse.mdx_lookup(word, True) == indexed.mdx_lookup(word, True)
+            for word in NORMALIZED:
+                assert sparse.mdx_lookup_normalized(word) == indexed.mdx_lookup_normalized(word)
+            assert sparse.mdx_lookup_many(WORDS) == indexed.mdx_lookup_many(WORDS)
+            assert sparse.mdx_lookup_normalized_many(NORMALIZED) == (
+                indexed.mdx_lookup_normalized_many(NORMALIZED)
+            )
+            assert sparse.get_mdx_keys("WORD00029*") == indexed.get_mdx_keys("WORD00029*")
+            assert sparse.get_mdx_keys() == indexed.get_mdx_keys()
+
+
+def test_sparse_mdd_lookup_covers_every_volume(mdx_path):
+    with IndexBuilder(str(mdx_path), backend="sparse") as sparse:
+        assert sparse.mdd_lookup("\\img\\a.png") == [b"\x89PNG-a"]
+        assert sparse.mdd_lookup("\\img\\b.png") == [b"\x89PNG-b"]
+        assert sparse.mdd_lookup("\\img\\c.png") == []
+
+
+def test_unsorted_directory_falls_back_to_scanning(tmp_path):
+    entries = [("zeta", "<p>z</p>")] + sample_entries(40)
+    path = write_mdx(tmp_path / "unsorted.mdx", entries, keys_per_block=8)
+    with IndexBuilder(str(path), backend="sparse") as sparse:
+        assert sparse._mdx_db._volumes[0].sort_key is None
+        assert sparse.mdx_lookup("word000039") == [
+            "<div class='def'>definition of word000039</div>"
+        ]
+        assert sparse.mdx_lookup("zeta") == ["<p>z</p>"]
+
+
+def test_case_sensitive_order_is_not_taken_for_a_lenient_one(tmp_path):
+    # one block from Apple to word000051: its range fits every order, its keys do not
+    entries = sorted(sample_entries(52) + [("Apple", "<p>Apple</p>"), ("alias", "<p>alias</p>")])
+    path = write_mdx(tmp_path / "case.mdx", entries, keys_per_block=64)
+    with IndexBuilder(str(path), backend="sparse") as sparse:
+        assert sparse._mdx_db._volumes[0].sort_key.__name__ == "_identity"
+        assert sparse.mdx_lookup("alias") == ["<p>alias</p>"]
+        assert sparse.mdx_lookup("Apple") == ["<p>Apple</p>"]
+        with IndexBuilder(str(path)) as indexed:
+            for word in ("alias", "Apple", "word000051", "missing"):
+                assert sparse.mdx_lookup(word) == indexed.mdx_lookup(word)
+
+
+def test_unsorted_keys_inside_a_block_fall_back_to_scanning(tmp_path):
+    # every block range is in order, but "zulu" sits inside the middle block
+    entries = sample_entries(30)
+    entries.insert(11, ("zulu", "<p>zulu</p>"))
+    path = write_mdx(tmp_path / "middle.mdx", entries, keys_per_block=10)
+    with IndexBuilder(str(path), backend="sparse") as sparse:
+        assert sparse._mdx_db._volumes[0].sort_key is not None
+        assert sparse.mdx_lookup("word000005") == [
+            "<div class='def'>definition of word000005</div>"
+        ]
+        assert sparse.mdx_lookup("zulu") == ["<p>zulu</p>"]
+        assert sparse._mdx_db._volumes[0].sort_key is None
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX directory permissions")
+def test_read_only_directory(mdx_path):
+    mode = mdx_path.parent.stat().st_mode
+    mdx_path.parent.chmod(stat.S_IRUSR | stat.S_IXUSR)
+    try:
+        with Dictionary(mdx_path, backend="sparse") as dictionary:
+            assert dictionary.lookup_html("APPLE") == "<p>Apple</p>"
+        assert not list(mdx_path.parent.glob("*.db"))
+    finally:
+        mdx_path.parent.chmod(mode)
@@ -0,0 +1,86 @@
+"""Tests for the SQLite pragma profiles of index builds and lookups"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from mdxscraper.mdict import IndexBuilder
+
+import mdict_query  # isort: skip
+
+
+def _pragma(conn, name):
+    return conn.execute("PRAGMA " + name).fetchone()[0]
+
+
+def test_fast_read_profile(mdx_path):
+    with IndexBuilder(str(mdx_path)) as builder:
+        conn = builder._connection(builder._mdx_db)
+        assert _pragma(conn, "query_only") == 1
+        assert _pragma(conn, "mmap_size") == 256 * 1024 * 1024
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM META")
+        assert builder.mdx_lookup("word000042") == [
+            "<div class='def'>definition of word000042</div>"
+        ]
+
+
+def test_default_profiles_leave_sqlite_defaults(mdx_path):
+    with IndexBuilder(str(mdx_path), build_profile="default", read_profile="default") as builder:
+        conn = builder._connection(builder._mdx_db)
+        assert _pragma(conn, "query_only") == 0
+        assert builder.mdx_lookup("word000042") == [
+            "<div class='def'>definition of word000042</div>"
+        ]
+
+
+def test_custom_build_pragmas(mdx_path):
+    IndexBuilder(str(mdx_path), build_profile={"page_size": 8192, "journal_mode": "OFF"}).close()
+    with sqlite3.connect(str(mdx_path) + ".db") as conn:
+        assert _pragma(conn, "page_size") == 8192
+    conn.close()
+
+
+def test_temp_tables_are_not_rolled_back_without_a_journal(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "build.db"))
+    mdict_query._apply_pragmas(conn, mdict_query.BUILD_PROFILES["fast"])
+    assert _pragma(conn, "journal_mode") == "off"
+    conn.execute("CREATE TABLE KEYS (key_text text)")
+    conn.execute("INSERT INTO KEYS VALUES ('built')")
+    statements = []
+    conn.set_trace_callback(statements.append)
+    with mdict_query._temp_table(conn, ["form"], [("built",)]):
+        assert conn.execute(
+            "SELECT k.key_text FROM temp.lookup_words w JOIN KEYS k ON k.key_text = w.form"
+        ).fetchall() == [("built",)]
+    conn.set_trace_callback(None)
+    assert not [s for s in statements if s.upper().startswith("ROLLBACK")]
+    assert conn.execute("SELECT key_text FROM KEYS").fetchall() == [("built",)]
+    conn.close()
+
+
+def test_index_is_reused_across_profiles(mdx_path):
+    IndexBuilder(str(mdx_path), build_profile="default").close()
+    db = mdx_path.parent / "sample.mdx.db"
+    mtime = db.stat().st_mtime_ns
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdx_lookup("word000001") == [
+            "<div class='def'>definition of word000001</div>"
+        ]
+    assert db.stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"build_profile": "fastest"},
+        {"read_profile": "unsafe"},
+        {"build_profile": {"cache_size": "1; DROP TABLE KEYS"}},
+        {"read_profile": {"mmap size": 1}},
+    ],
+)
+def test_invalid_profiles_are_rejected(mdx_path, options):
+    with pytest.raises(ValueError):
+        IndexBuilder(str(mdx_path), **options)
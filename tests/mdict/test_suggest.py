@@ -0,0 +1,108 @@
+"""Tests for "did you mean" suggestions from the symmetric delete index"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from fixtures.mdict_writer import sample_entries
+
+from mdxscraper.core.dictionary import Dictionary
+from mdxscraper.mdict import IndexBuilder
+
+import mdict_query  # isort: skip
+from mdict_suggest import SuggestionIndex, edit_distance  # isort: skip
+
+KEYS = ["Apple", "apply", "ample", "maple", "banana", "apple", "color", "Colour", "extraordinarily"]
+
+
+@pytest.fixture
+def mdx_entries():
+    return sorted(sample_entries(50) + [(key, f"<p>{key}</p>") for key in KEYS])
+
+
+@pytest.fixture
+def mdx_options():
+    return {"records_per_block": 8}
+
+
+@pytest.mark.parametrize(
+    "a, b, distance",
+    [
+        ("apple", "apple", 0),
+        ("apple", "appel", 1),  # transposition
+        ("apple", "aple", 1),
+        ("apple", "apples", 1),
+        ("apple", "ample", 1),
+        ("kitten", "sitting", 3),
+        ("ab", "ba", 1),
+        ("", "ab", 2),
+    ],
+)
+def test_edit_distance(a, b, distance):
+    assert edit_distance(a, b, 3) == distance
+    assert edit_distance(a, b, 1) == min(distance, 2)
+
+
+def test_suggestions_are_the_closest_keys():
+    index = SuggestionIndex.build(KEYS)
+    # keys equal up to case are suggested once, as first seen
+    assert index.keys.count("Apple") == 1 and "apple" not in index.keys
+    assert index.suggest("appel") == ["Apple", "apply", "ample"]
+    assert index.suggest("APLE", max_distance=1) == ["Apple", "ample", "maple"]
+    assert index.suggest("colr") == ["color", "Colour"]
+    assert index.suggest("apple") == ["apply", "ample", "maple"]
+    assert index.suggest("appel", limit=1) == ["Apple"]
+    assert index.suggest("extraordinarlyi") == ["extraordinarily"]
+    assert index.suggest("xyzzy") == []
+
+
+def test_index_round_trips_through_a_file(tmp_path):
+    index = SuggestionIndex.build(KEYS)
+    path = str(tmp_path / "x.suggest")
+    index.write(path)
+    loaded = SuggestionIndex.load(path)
+    assert loaded.keys == index.keys
+    assert loaded.suggest("appel") == index.suggest("appel")
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 8)
+    with pytest.raises(ValueError):
+        SuggestionIndex.load(path)
+
+
+def test_index_is_built_once_beside_the_db(mdx_path, monkeypatch):
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdx_suggest_many(["colr", "word00001", "xyzzy"]) == [
+            ["color", "Colour"],
+            ["word000001", "word000010", "word000011", "word000012", "word000013"],
+            [],
+        ]
+    path = mdx_path.parent / "sample.mdx.suggest"
+    built = path.stat().st_mtime_ns
+
+    def no_build(*args, **kwargs):
+        raise AssertionError("rebuilt the suggestion index")
+
+    monkeypatch.setattr(mdict_query, "build_suggestion_index", no_build)
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdx_suggest_many(["appel"], limit=2) == [["Apple", "ample"]]
+    assert path.stat().st_mtime_ns == built
+
+
+def test_index_older_than_the_db_is_rebuilt(mdx_path):
+    with IndexBuilder(str(mdx_path)) as builder:
+        builder.mdx_suggest_many(["colr"])
+    path = mdx_path.parent / "sample.mdx.suggest"
+    SuggestionIndex.build(["stale"]).write(str(path))
+    os.utime(path, (0, 0))
+    with IndexBuilder(str(mdx_path)) as builder:
+        assert builder.mdx_suggest_many(["colr"]) == [["color", "Colour"]]
+
+
+def test_dictionary_suggestions_without_index_files(mdx_path):
+    for backend in ("sqlite", "sparse"):
+        with Dictionary(mdx_path, backend=backend) as dictionary:
+            assert dictionary.suggest_many([" colr ", "appel"], limit=2) == [
+                ["color", "Colour"],
+                ["Apple", "ample"],
+            ]
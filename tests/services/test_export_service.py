@@ -5,6 +5,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from mdxscraper.config.config_manager import ConfigManager
 from mdxscraper.services.export_service import ExportService
 from mdxscraper.services.presets_service import PresetsService
 from mdxscraper.services.settings_service import SettingsService
@@ -115,6 +116,97 @@ def test_build_image_options_png():
     assert result["png_compress_level"] == 6
 
 
+def test_build_index_options():
+    """Test index cache options from the advanced settings"""
+    settings = Mock(spec=SettingsService)
+    settings.get.side_effect = lambda key, default=None: {
+        "advanced.index_cache_dir": "data/index_cache",
+        "advanced.index_cache_size_mb": 2,
+    }.get(key, default)
+    settings.resolve_path.side_effect = lambda p: Path("/project") / p
+
+    service = ExportService(settings, Mock(spec=PresetsService))
+    result = service.build_index_options()
+
+    assert result == {
+        "index_dir": str(Path("/project/data/index_cache")),
+        "index_cache_size": 2 * 1024 * 1024,
+    }
+
+
+def test_build_index_options_beside_dictionary():
+    """Test that an empty cache directory keeps indexes beside the dictionary"""
+    settings = Mock(spec=SettingsService)
+    settings.get.side_effect = lambda key, default=None: {"advanced.index_cache_dir": ""}.get(
+        key, default
+    )
+
+    service = ExportService(settings, Mock(spec=PresetsService))
+
+    assert service.build_index_options() == {}
+
+
+def test_build_index_options_sqlite_profiles():
+    """Test SQLite profiles from the advanced settings"""
+    settings = Mock(spec=SettingsService)
+    settings.get.side_effect = lambda key, default=None: {
+        "advanced.index_build_profile": "fast",
+        "advanced.index_read_profile": "default",
+        "advanced.index_cache_dir": "",
+    }.get(key, default)
+
+    service = ExportService(settings, Mock(spec=PresetsService))
+
+    assert service.build_index_options() == {"build_profile": "fast", "read_profile": "default"}
+
+
+def test_build_index_options_bloom_filter():
+    """Test Bloom filter options from the advanced settings"""
+    settings = Mock(spec=SettingsService)
+    settings.get.side_effect = lambda key, default=None: {
+        "advanced.bloom_filter_error_rate": 0.01,
+        "advanced.bloom_filter_size_mb": 4,
+        "advanced.index_cache_dir": "",
+    }.get(key, default)
+
+    service = ExportService(settings, Mock(spec=PresetsService))
+
+    assert service.build_index_options() == {
+        "bloom_error_rate": 0.01,
+        "bloom_max_size": 4 * 1024 * 1024,
+    }
+
+
+def test_build_index_options_bloom_filter_from_config(tmp_path):
+    """Test that a Bloom filter error rate survives config normalization"""
+    settings = SettingsService(tmp_path, ConfigManager(tmp_path))
+    settings.load()
+    config = settings.get_config_dict()
+    config["advanced"]["bloom_filter_error_rate"] = 0.01
+    settings.replace_config(config)
+
+    service = ExportService(settings, Mock(spec=PresetsService))
+
+    assert service.build_index_options()["bloom_error_rate"] == 0.01
+
+
+def test_build_index_options_workers():
+    """Test that index builds stay serial unless advanced.index_workers asks for more"""
+    settings = Mock(spec=SettingsService)
+    values = {"advanced.index_cache_dir": ""}
+    settings.get.side_effect = lambda key, default=None: values.get(key, default)
+    service = ExportService(settings, Mock(spec=PresetsService))
+
+    assert service.build_index_options() == {}
+    values["advanced.index_workers"] = 1
+    assert service.build_index_options() == {}
+    values["advanced.index_workers"] = 4
+    assert service.build_index_options() == {"workers": 4}
+    values["advanced.index_workers"] = 0
+    with patch("os.cpu_count", return_value=6):
+        assert service.build_index_options() == {"workers": 6}
+
+
 def test_parse_css_styles():
     """Test parsing CSS styles"""
     settings = Mock(spec=SettingsService)
@@ -196,3 +288,44 @@ def test_execute_export_image(mock_mdx2img):
 
     assert result == (8, 0, [])
     mock_mdx2img.assert_called_once()
+
+
+@patch("mdxscraper.core.converter.mdx2html")
+def test_execute_export_lemma_fallback(mock_mdx2html):
+    """Test that the lemma fallback follows the advanced settings"""
+    mock_mdx2html.return_value = (1, 0, [])
+
+    settings = Mock(spec=SettingsService)
+    settings.get.side_effect = lambda key, default=None: {
+        "advanced.lemma_fallback": True,
+        "advanced.index_cache_dir": "",
+    }.get(key, default)
+    presets = Mock(spec=PresetsService)
+    presets.parse_css_preset.return_value = (None, None, None)
+    service = ExportService(settings, presets)
+
+    service.execute_export(
+        Path("test.txt"), Path("dict.mdx"), Path("output.html"), settings_service=settings
+    )
+
+    assert mock_mdx2html.call_args.kwargs["lemma_fallback"] is True
+
+
+def test_build_suggestion_options():
+    """Test "did you mean" options from the advanced settings"""
+    settings = Mock(spec=SettingsService)
+    settings.get.side_effect = lambda key, default=None: {
+        "advanced.suggestions": 3,
+        "advanced.suggestions_in_output": True,
+    }.get(key, default)
+
+    service = ExportService(settings, Mock(spec=PresetsService))
+
+    assert service.build_suggestion_options() == {"suggestions": 3, "suggestions_in_output": True}
+    settings.get.side_effect = lambda key, default=None: {"advanced.suggestions": "x"}.get(
+        key, default
+    )
+    assert service.build_suggestion_options() == {
+        "suggestions": 0,
+        "suggestions_in_output": False,
+    }
@@ -6,6 +6,8 @@ from unittest.mock import call, mock_open, patch
 
 import pytest
 
+from mdxscraper.core.converter import InvalidWord
+from mdxscraper.core.parser import WordParser
 from mdxscraper.utils.file_utils import (
     get_image_format_from_src,
     write_invalid_words_file,
@@ -48,6 +50,22 @@ def test_write_invalid_words_file_single_lesson():
         handle.write.assert_has_calls(expected_calls)
 
 
+def test_write_invalid_words_file_with_suggestions(tmp_path):
+    """Test that suggestions follow their word as a comment the parser ignores"""
+    invalid_words = OrderedDict()
+    invalid_words["Lesson 1"] = [InvalidWord("colr", ["color", "colour"]), "xyzzy"]
+    output_file = tmp_path / "test_invalid.txt"
+
+    write_invalid_words_file(invalid_words, output_file)
+
+    assert output_file.read_text(encoding="utf-8") == (
+        "# Lesson 1\ncolr  # did you mean: color, colour\nxyzzy\n\n"
+    )
+    assert WordParser(str(output_file)).parse() == [
+        {"name": "Lesson 1", "words": ["colr", "xyzzy"]}
+    ]
+
+
 def test_write_invalid_words_file_multiple_lessons():
     """Test writing invalid words file with multiple lessons"""
     invalid_words = OrderedDict()